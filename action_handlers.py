@@ -3,9 +3,17 @@ Action Handlers Module
 Execute actions returned by the brain model.
 """
 
-from typing import Dict, Any, List
+import asyncio
+import functools
+import html
+from typing import Dict, Any, List, Tuple
 from apple_integrations import NotesIntegration, RemindersIntegration
 
+# Apple Notes HTML fragments for the Groceries note
+_TITLE_TMPL = '<div><h1>{}</h1><br>'
+_SECTION_TMPL = '<h2>{}</h2>{}<br>'
+_ITEM_TMPL = '<div><en-todo/>{}</div>'
+
 
 class ActionExecutor:
     """Execute actions from the brain model."""
@@ -25,7 +33,7 @@ class ActionExecutor:
         }
         """
         action_type = action.get('action_type')
-        arguments = action.get('arguments', {})
+        arguments = action.get('arguments') or {}
 
         try:
             if action_type == 'update_apple_note':
@@ -44,25 +52,54 @@ class ActionExecutor:
 
     def execute_actions(self, actions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Execute a list of actions and return results."""
+        return asyncio.run(self.execute_actions_async(actions))
+
+    async def execute_actions_async(self, actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Execute a list of actions concurrently and return results."""
         results = {
             'success_count': 0,
             'failure_count': 0,
             'errors': []
         }
 
-        for action in actions:
-            success = self.execute_action(action)
-            if success:
-                results['success_count'] += 1
-            else:
-                results['failure_count'] += 1
-                results['errors'].append({
-                    'action_type': action.get('action_type'),
-                    'error': 'Execution failed'
-                })
+        # Reminder deletions are batched into one script call; everything
+        # else (note updates) runs one action at a time. The two groups
+        # touch different apps, so they run concurrently.
+        delete_actions = [a for a in actions if a.get('action_type') == 'delete_reminder']
+        other_actions = [a for a in actions if a.get('action_type') != 'delete_reminder']
+
+        groups = []
+        if delete_actions:
+            groups.append((delete_actions, asyncio.to_thread(self._delete_reminders, delete_actions)))
+        if other_actions:
+            groups.append((other_actions, asyncio.to_thread(self._execute_in_order, other_actions)))
+
+        # A group that raises fails only its own actions
+        outcomes = await asyncio.gather(*(task for _, task in groups), return_exceptions=True)
+
+        for (batch, _), successes in zip(groups, outcomes):
+            error = 'Execution failed'
+            if isinstance(successes, Exception):
+                print(f"Error executing {batch[0].get('action_type')} actions: {successes}")
+                error = str(successes)
+                successes = [False] * len(batch)
+
+            for action, success in zip(batch, successes):
+                if success:
+                    results['success_count'] += 1
+                else:
+                    results['failure_count'] += 1
+                    results['errors'].append({
+                        'action_type': action.get('action_type'),
+                        'error': error
+                    })
 
         return results
 
+    def _execute_in_order(self, actions: List[Dict[str, Any]]) -> List[bool]:
+        """Execute actions sequentially, returning one success flag per action."""
+        return [self.execute_action(action) for action in actions]
+
     def _update_apple_note(self, arguments: Dict[str, Any]) -> bool:
         """
         Update the Groceries note in Apple Notes.
@@ -111,36 +148,10 @@ class ActionExecutor:
         Build the HTML body for the Apple Note with checkboxes.
 
         Apple Notes uses HTML format. Checkboxes are created using:
-        <ul><li><input type="checkbox"> Item text</li></ul>
+        <div><en-todo/>Item text</div>
+        Title, section names and item text are HTML-escaped.
         """
-        sections = layout.get('sections', [])
-
-        # Start with title
-        html_parts = [
-            f'<div><h1>{title}</h1>',
-            '<br>'
-        ]
-
-        # Add each section
-        for section in sections:
-            section_name = section.get('name', 'Uncategorized')
-            items = section.get('items', [])
-
-            if not items:
-                continue
-
-            # Section header
-            html_parts.append(f'<h2>{section_name}</h2>')
-
-            # Checklist items (en-todo creates checkboxes, no ul/li needed)
-            for item in items:
-                item_text = item.get('text', '')
-                html_parts.append(f'<div><en-todo/>{item_text}</div>')
-            html_parts.append('<br>')
-
-        html_parts.append('</div>')
-
-        return '\n'.join(html_parts)
+        return _render_note_body(title, _normalize_layout(layout))
 
     def _delete_reminder(self, arguments: Dict[str, Any]) -> bool:
         """
@@ -166,6 +177,69 @@ class ActionExecutor:
 
         return success
 
+    def _delete_reminders(self, actions: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Delete the reminders for several delete_reminder actions at once.
+        Returns one success flag per action, in order.
+        """
+        reminder_ids = [(action.get('arguments') or {}).get('source_id') for action in actions]
+        deleted = self.reminders.delete_reminders([rid for rid in reminder_ids if rid])
+
+        outcomes = []
+        for reminder_id in reminder_ids:
+            if not reminder_id:
+                print("Error: No source_id provided for delete_reminder")
+                outcomes.append(False)
+            elif reminder_id in deleted:
+                print(f"✓ Deleted reminder: {reminder_id}")
+                outcomes.append(True)
+            else:
+                print(f"✗ Failed to delete reminder: {reminder_id}")
+                outcomes.append(False)
+
+        return outcomes
+
+
+def _normalize_layout(layout: Dict[str, Any]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    Flatten a note layout into (section_name, item_texts) pairs.
+    Sections without items are dropped. The result is hashable, so
+    identical layouts share one cached rendering.
+    """
+    sections = []
+    for section in layout.get('sections', []):
+        items = section.get('items', [])
+        if items:
+            sections.append((str(section.get('name', 'Uncategorized')),
+                             tuple(str(item.get('text', '')) for item in items)))
+    return tuple(sections)
+
+
+@functools.lru_cache(maxsize=64)
+def _render_note_body(title: str, sections: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> str:
+    """Render a normalized layout to Apple Notes HTML."""
+    # Start with title
+    html_parts = [_TITLE_TMPL.format(html.escape(title))]
+
+    # Add each section (en-todo creates checkboxes, no ul/li needed)
+    for section_name, item_texts in sections:
+        item_html = ''.join(_ITEM_TMPL.format(html.escape(text)) for text in item_texts)
+        html_parts.append(_SECTION_TMPL.format(html.escape(section_name), item_html))
+
+    html_parts.append('</div>')
+
+    return ''.join(html_parts)
+
+
+@functools.lru_cache(maxsize=1)
+def get_executor() -> ActionExecutor:
+    """
+    Return the shared ActionExecutor.
+    Integration state (script hosts, known folders) lives on the classes,
+    so one executor can serve every request.
+    """
+    return ActionExecutor()
+
 
 # Test function
 if __name__ == "__main__":
@@ -1,223 +1,567 @@
 """
 Apple Integrations Module
-Interface to Apple Reminders and Apple Notes via AppleScript/osascript.
+Interface to Apple Reminders and Apple Notes via JavaScript for Automation (JXA).
+
+All scripts run inside a single long-lived `osascript -l JavaScript` process
+(see `_ScriptHost`, one per app) instead of spawning a fresh osascript per call.
+Each method has an `*_async` counterpart that runs it off the event loop.
+
+`store_version()` reads the apps' own SQLite stores (read-only) so callers can
+skip a listing when nothing has changed; it returns None when the store can't
+be read, in which case callers should always list.
 """
 
-import subprocess
+import asyncio
+import atexit
+import glob
 import json
-from typing import List, Dict, Optional
+import os
+import select
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Dict, Optional, Set, Tuple
+
+try:
+    import EventKit
+except ImportError:  # PyObjC not installed; fall back to JXA
+    EventKit = None
+
+
+# JXA loop run by the persistent osascript process. Each request is a single
+# JSON line: {"define": name, "source": src} compiles a function once and keeps
+# it for the life of the process, {"call": name, "args": [...]} invokes it.
+# Each response is a single JSON line followed by a sentinel line.
+_HOST_LOOP = r'''
+ObjC.import('Foundation');
+var stdin = $.NSFileHandle.fileHandleWithStandardInput;
+var stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+var handlers = {};
+var buffer = '';
+
+function emit(response) {
+    var text = JSON.stringify(response) + '\n__END__\n';
+    stdout.writeData($(text).dataUsingEncoding($.NSUTF8StringEncoding));
+}
+
+function handle(request) {
+    if (request.define) {
+        handlers[request.define] = eval('(' + request.source + ')');
+        return true;
+    }
+    return handlers[request.call].apply(null, request.args);
+}
+
+while (true) {
+    var data = stdin.availableData;
+    if (data.length == 0) {
+        break;
+    }
+    var chunk = $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+    buffer += chunk;
+
+    // Large requests (e.g. long note bodies) arrive over many reads; only
+    // rescan the buffer once the newly read chunk completes a line
+    if (chunk.indexOf('\n') < 0) {
+        continue;
+    }
+
+    var newline;
+    while ((newline = buffer.indexOf('\n')) >= 0) {
+        var line = buffer.slice(0, newline);
+        buffer = buffer.slice(newline + 1);
+        if (!line) {
+            continue;
+        }
+        try {
+            var result = handle(JSON.parse(line));
+            emit({ok: true, result: result === undefined ? null : result});
+        } catch (e) {
+            emit({ok: false, error: String(e)});
+        }
+    }
+}
+'''
+
+_SENTINEL = b'\n__END__\n'
+
+
+class _ScriptHost:
+    """
+    Persistent `osascript -l JavaScript` process that runs JXA functions.
+
+    Spawning osascript costs seconds per call, so one process is kept alive
+    per target app and scripts are exchanged over its stdin/stdout. Each
+    function is compiled once per process; later calls only send the
+    function name and JSON arguments. Calls to the same app are serialized
+    with a lock since the pipe carries one request at a time; Reminders and
+    Notes work can overlap.
+    """
+
+    _instances: Dict[str, '_ScriptHost'] = {}
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._buffer = b''
+        self._compiled: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, app_name: str) -> '_ScriptHost':
+        """Return the shared script host for an app, creating it on first use."""
+        with cls._instance_lock:
+            host = cls._instances.get(app_name)
+            if host is None:
+                host = cls._instances[app_name] = cls()
+                atexit.register(host.close)
+            return host
+
+    def call(self, name: str, source: str, args: List[Any],
+             timeout: float = 30) -> Any:
+        """Run a JXA function (compiling it on first use) and return its result."""
+        with self._lock:
+            try:
+                return self._call_locked(name, source, args, timeout)
+            except BrokenPipeError:
+                # Host died between calls, so the request never ran; restart once
+                self._stop()
+                return self._call_locked(name, source, args, timeout)
+
+    def close(self):
+        """Terminate the host process."""
+        with self._lock:
+            self._stop()
+
+    def _call_locked(self, name: str, source: str, args: List[Any],
+                     timeout: float) -> Any:
+        if self._proc is None or self._proc.poll() is not None:
+            self._start()
+
+        if name not in self._compiled:
+            self._request({'define': name, 'source': source}, timeout)
+            self._compiled.add(name)
+
+        return self._request({'call': name, 'args': args}, timeout)
+
+    def _request(self, payload: Dict[str, Any], timeout: float) -> Any:
+        # json.dumps escapes non-ASCII, so the host can decode each read on
+        # its own without splitting a multi-byte character
+        self._proc.stdin.write(json.dumps(payload).encode('ascii') + b'\n')
+
+        try:
+            response = json.loads(self._read_response(timeout))
+        except Exception:
+            self._stop()
+            raise
+
+        if not response.get('ok'):
+            raise RuntimeError(f"JXA error: {response.get('error')}")
+
+        return response.get('result')
+
+    def _start(self):
+        self._proc = subprocess.Popen(
+            ['osascript', '-l', 'JavaScript', '-e', _HOST_LOOP],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+        self._buffer = b''
+        self._compiled.clear()
+
+    def _stop(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=5)
+            except Exception:
+                pass
+        self._proc = None
+        self._buffer = b''
+        self._compiled.clear()
+
+    def _read_response(self, timeout: float) -> str:
+        """Read stdout until the next sentinel, honoring the timeout."""
+        deadline = time.monotonic() + timeout
+        fd = self._proc.stdout.fileno()
+
+        while _SENTINEL not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for osascript")
+
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise RuntimeError("osascript host exited unexpectedly")
+            self._buffer += chunk
+
+        response, self._buffer = self._buffer.split(_SENTINEL, 1)
+        return response.decode('utf-8')
+
+
+def _call(app_name: str, script_name: str, *args) -> Any:
+    """Invoke a named JXA function on the app's host with JSON-encoded arguments."""
+    return _ScriptHost.get(app_name).call(script_name, _SCRIPTS[script_name], list(args))
+
+
+_JS_LIST_REMINDERS = '''function (listName, since) {
+    var app = Application('Reminders');
+    var lists = listName === null ? app.lists() : [app.lists.byName(listName)];
+    var output = [];
+    lists.forEach(function (lst) {
+        var lstName = lst.name();
+        // Let Reminders filter by modification date so unchanged items aren't fetched
+        var reminders = since === null ? lst.reminders :
+            lst.reminders.whose({modificationDate: {_greaterThanEquals: new Date(since)}});
+        // One record per reminder from a single Apple Event; separate per-field
+        // arrays could pair up different reminders if the list changes between reads
+        reminders.properties().forEach(function (props) {
+            output.push({
+                id: props.id,
+                name: props.name,
+                body: props.body || '',
+                completed: props.completed,
+                list_name: lstName,
+                modification_date: props.modificationDate
+            });
+        });
+    });
+    return output;
+}'''
+
+_JS_DELETE_REMINDERS = '''function (reminderIds) {
+    var app = Application('Reminders');
+    var remaining = {};
+    var pending = 0;
+    var deleted = [];
+
+    // Fast path: address each reminder directly by id
+    reminderIds.forEach(function (id) {
+        try {
+            app.reminders.byId(id).delete();
+            deleted.push(id);
+        } catch (e) {
+            remaining[id] = true;
+            pending++;
+        }
+    });
+
+    // Fall back to scanning lists for anything the direct lookup missed
+    var lists = pending > 0 ? app.lists() : [];
+    for (var i = 0; i < lists.length && pending > 0; i++) {
+        var reminders = lists[i].reminders;
+        var ids = reminders.id();
+        // Walk backwards so deleting doesn't shift the indexes still to visit
+        for (var j = ids.length - 1; j >= 0 && pending > 0; j--) {
+            if (remaining[ids[j]]) {
+                reminders[j].delete();
+                delete remaining[ids[j]];
+                deleted.push(ids[j]);
+                pending--;
+            }
+        }
+    }
+    return deleted;
+}'''
+
+_JS_LIST_NOTES = '''function (folderName, since) {
+    var app = Application('Notes');
+    var folders = folderName === null ? app.folders() : [app.folders.byName(folderName)];
+    var output = [];
+    folders.forEach(function (fld) {
+        var fldName = fld.name();
+        // Let Notes filter by modification date so unchanged bodies aren't fetched
+        var notes = since === null ? fld.notes :
+            fld.notes.whose({modificationDate: {_greaterThanEquals: new Date(since)}});
+        // One record per note from a single Apple Event (see list_reminders)
+        notes.properties().forEach(function (props) {
+            output.push({
+                id: props.id,
+                name: props.name,
+                body: props.body || '',
+                folder_name: fldName,
+                modification_date: props.modificationDate
+            });
+        });
+    });
+    return output;
+}'''
+
+_JS_ENSURE_FOLDER = '''function (folderName) {
+    var app = Application('Notes');
+    if (app.folders.name().indexOf(folderName) < 0) {
+        app.folders.push(app.Folder({name: folderName}));
+    }
+    return true;
+}'''
+
+_JS_CREATE_OR_UPDATE_NOTE = '''function (folderName, noteTitle, noteBody) {
+    var app = Application('Notes');
+    var folder = app.folders.byName(folderName);
+    var index = folder.notes.name().indexOf(noteTitle);
+    if (index >= 0) {
+        folder.notes[index].body = noteBody;
+    } else {
+        folder.notes.push(app.Note({name: noteTitle, body: noteBody}));
+    }
+    return true;
+}'''
+
+_JS_GET_NOTE = '''function (folderName, noteTitle) {
+    var folder = Application('Notes').folders.byName(folderName);
+    var index = folder.notes.name().indexOf(noteTitle);
+    if (index < 0) {
+        return null;
+    }
+    var note = folder.notes[index];
+    return {id: note.id(), name: note.name(), body: note.body()};
+}'''
+
+
+_SCRIPTS = {
+    'list_reminders': _JS_LIST_REMINDERS,
+    'delete_reminders': _JS_DELETE_REMINDERS,
+    'list_notes': _JS_LIST_NOTES,
+    'ensure_folder': _JS_ENSURE_FOLDER,
+    'create_or_update_note': _JS_CREATE_OR_UPDATE_NOTE,
+    'get_note': _JS_GET_NOTE,
+}
+
+
+class _EventKitReminders:
+    """
+    Direct EventKit access to Reminders via PyObjC.
+
+    Looks reminders up by identifier instead of scanning lists. Only used
+    when PyObjC is installed and the process already has Reminders access;
+    otherwise every method is a no-op and callers fall back to JXA.
+    """
+
+    _store = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_store(cls):
+        if EventKit is None:
+            return None
+
+        status = EventKit.EKEventStore.authorizationStatusForEntityType_(
+            EventKit.EKEntityTypeReminder)
+        if status != EventKit.EKAuthorizationStatusAuthorized:
+            return None
+
+        with cls._lock:
+            if cls._store is None:
+                cls._store = EventKit.EKEventStore.alloc().init()
+            return cls._store
+
+    @classmethod
+    def delete(cls, reminder_ids: List[str]) -> Set[str]:
+        """Delete reminders by ID. Returns the set of IDs that were deleted."""
+        deleted = set()
+
+        try:
+            store = cls._get_store()
+            if store is None:
+                return deleted
+
+            for reminder_id in reminder_ids:
+                # Scripting ids look like x-apple-reminder://<calendarItemIdentifier>
+                identifier = reminder_id.rsplit('/', 1)[-1]
+                reminder = store.calendarItemWithIdentifier_(identifier)
+                if reminder is None:
+                    continue
+
+                removed, _ = store.removeReminder_commit_error_(reminder, False, None)
+                if removed:
+                    deleted.add(reminder_id)
+
+            if deleted:
+                committed, _ = store.commit_(None)
+                if not committed:
+                    store.reset()
+                    deleted.clear()
+
+        except Exception as e:
+            print(f"Exception deleting reminders via EventKit: {e}")
+
+        return deleted
+
+
+class _SqliteStore:
+    """
+    Read-only view of an app's Core Data SQLite store(s).
+
+    Only used to detect changes: `version()` returns a small summary (row
+    count and newest modification time per store) that changes whenever a
+    record is added, edited or removed.
+    """
+
+    def __init__(self, patterns: List[str], table: str, modified_column: str):
+        self.patterns = patterns
+        self.query = f"SELECT COUNT(*), MAX({modified_column}) FROM {table}"
+
+    def version(self) -> Optional[Tuple]:
+        """Return the stores' change summary, or None if they can't be read."""
+        paths = sorted(path for pattern in self.patterns for path in glob.glob(pattern))
+        if not paths:
+            return None
+
+        versions = []
+        for path in paths:
+            try:
+                conn = sqlite3.connect(f"{Path(path).as_uri()}?mode=ro", uri=True, timeout=1)
+                try:
+                    versions.append(tuple(conn.execute(self.query).fetchone()))
+                finally:
+                    conn.close()
+
+            except sqlite3.Error:
+                # Missing table/column (schema changed) or no permission
+                return None
+
+        return tuple(versions)
+
+
+_LIBRARY = Path.home() / "Library"
+
+_REMINDERS_STORE = _SqliteStore(
+    [str(_LIBRARY / "Group Containers" / "group.com.apple.reminders" / "Container_v1"
+         / "Stores" / "Data-*.sqlite"),
+     str(_LIBRARY / "Reminders" / "Container_v1" / "Stores" / "Data-*.sqlite")],
+    table="ZREMCDREMINDER", modified_column="ZLASTMODIFIEDDATE")
+
+_NOTES_STORE = _SqliteStore(
+    [str(_LIBRARY / "Group Containers" / "group.com.apple.notes" / "NoteStore.sqlite")],
+    table="ZICCLOUDSYNCINGOBJECT", modified_column="ZMODIFICATIONDATE1")
 
 
 class RemindersIntegration:
     """Interface to Apple Reminders."""
 
     @staticmethod
-    def list_reminders(list_name: Optional[str] = None) -> List[Dict]:
+    def list_reminders(list_name: Optional[str] = None,
+                       since: Optional[str] = None) -> Optional[List[Dict]]:
         """
-        List all reminders (optionally filtered by list name).
-        Returns list of dicts with id, name, body, completed, list_name.
+        List all reminders (optionally filtered by list name, and to those
+        modified at or after `since`, an ISO-8601 timestamp).
+        Returns list of dicts with id, name, body, completed, list_name,
+        modification_date, or None if the listing failed.
         """
-        if list_name:
-            script = f'''
-                tell application "Reminders"
-                    set outputList to {{}}
-                    set targetList to list "{list_name}"
-                    repeat with r in reminders of targetList
-                        set rId to id of r
-                        set rName to name of r
-                        set rBody to body of r
-                        set rCompleted to completed of r
-                        set rListName to "{list_name}"
-                        set end of outputList to {{rId, rName, rBody, rCompleted, rListName}}
-                    end repeat
-                    return outputList
-                end tell
-            '''
-        else:
-            script = '''
-                tell application "Reminders"
-                    set outputList to {}
-                    repeat with lst in lists
-                        set lstName to name of lst
-                        repeat with r in reminders of lst
-                            set rId to id of r
-                            set rName to name of r
-                            set rBody to body of r
-                            set rCompleted to completed of r
-                            set end of outputList to {rId, rName, rBody, rCompleted, lstName}
-                        end repeat
-                    end repeat
-                    return outputList
-                end tell
-            '''
-
         try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode != 0:
-                print(f"Error listing reminders: {result.stderr}")
-                return []
-
-            # Parse AppleScript list output
-            output = result.stdout.strip()
-            if not output or output == "":
-                return []
-
-            # Parse the AppleScript list format
-            reminders = RemindersIntegration._parse_applescript_list(output)
-            return reminders
+            return _call('Reminders', 'list_reminders', list_name, since) or []
 
         except Exception as e:
             print(f"Exception listing reminders: {e}")
-            return []
+            return None
 
     @staticmethod
-    def _parse_applescript_list(output: str) -> List[Dict]:
-        """Parse AppleScript list output into Python dicts."""
-        # AppleScript returns comma-separated values:
-        # id, name, body, completed, listName, id, name, body, completed, listName, ...
-        reminders = []
-
-        if not output or output.strip() == "":
-            return []
-
-        # Split by comma
-        parts = [p.strip() for p in output.split(',')]
-
-        # Group into sets of 5 (id, name, body, completed, listName)
-        i = 0
-        while i + 4 < len(parts):
-            reminder = {
-                'id': parts[i].strip(),
-                'name': parts[i+1].strip(),
-                'body': parts[i+2].strip() if parts[i+2].strip() != 'missing value' else '',
-                'completed': parts[i+3].strip() == 'true',
-                'list_name': parts[i+4].strip()
-            }
-            reminders.append(reminder)
-            i += 5
+    async def list_reminders_async(list_name: Optional[str] = None,
+                                   since: Optional[str] = None) -> Optional[List[Dict]]:
+        """Async version of list_reminders."""
+        return await asyncio.to_thread(RemindersIntegration.list_reminders, list_name, since)
 
-        return reminders
+    @staticmethod
+    def store_version() -> Optional[Tuple]:
+        """
+        Change summary of the Reminders database, read directly from SQLite.
+        Returns None if it can't be read (callers should then always list).
+        """
+        return _REMINDERS_STORE.version()
+
+    @staticmethod
+    async def store_version_async() -> Optional[Tuple]:
+        """Async version of store_version."""
+        return await asyncio.to_thread(RemindersIntegration.store_version)
 
     @staticmethod
     def delete_reminder(reminder_id: str) -> bool:
         """Delete a reminder by its ID."""
-        script = f'''
-            tell application "Reminders"
-                repeat with lst in lists
-                    repeat with r in reminders of lst
-                        if id of r is "{reminder_id}" then
-                            delete r
-                            return true
-                        end if
-                    end repeat
-                end repeat
-                return false
-            end tell
-        '''
+        return reminder_id in RemindersIntegration.delete_reminders([reminder_id])
 
-        try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+    @staticmethod
+    async def delete_reminder_async(reminder_id: str) -> bool:
+        """Async version of delete_reminder."""
+        return await asyncio.to_thread(RemindersIntegration.delete_reminder, reminder_id)
+
+    @staticmethod
+    def delete_reminders(reminder_ids: List[str]) -> Set[str]:
+        """
+        Delete several reminders at once.
+        Uses EventKit when available, otherwise a single JXA call.
+        Returns the set of IDs that were found and deleted.
+        """
+        unique_ids = list(dict.fromkeys(reminder_ids))
+        if not unique_ids:
+            return set()
+
+        deleted = _EventKitReminders.delete(unique_ids)
+        remaining = [rid for rid in unique_ids if rid not in deleted]
+        if not remaining:
+            return deleted
 
-            return result.returncode == 0 and 'true' in result.stdout.lower()
+        try:
+            return deleted | set(_call('Reminders', 'delete_reminders', remaining) or [])
 
         except Exception as e:
-            print(f"Exception deleting reminder: {e}")
-            return False
+            print(f"Exception deleting reminders: {e}")
+            return deleted
+
+    @staticmethod
+    async def delete_reminders_async(reminder_ids: List[str]) -> Set[str]:
+        """Async version of delete_reminders."""
+        return await asyncio.to_thread(RemindersIntegration.delete_reminders, reminder_ids)
 
 
 class NotesIntegration:
     """Interface to Apple Notes."""
 
+    # Folders already confirmed to exist, so the ensure step can be skipped
+    _known_folders: Set[str] = set()
+    _known_folders_lock = threading.Lock()
+
     @staticmethod
-    def list_notes(folder_name: Optional[str] = None) -> List[Dict]:
+    def list_notes(folder_name: Optional[str] = None,
+                   since: Optional[str] = None) -> Optional[List[Dict]]:
         """
-        List all notes (optionally filtered by folder name).
-        Returns list of dicts with id, name, body, folder_name, modification_date.
+        List all notes (optionally filtered by folder name, and to those
+        modified at or after `since`, an ISO-8601 timestamp).
+        Returns list of dicts with id, name, body, folder_name, modification_date,
+        or None if the listing failed.
         """
-        if folder_name:
-            script = f'''
-                tell application "Notes"
-                    set outputList to {{}}
-                    set targetFolder to folder "{folder_name}"
-                    repeat with n in notes of targetFolder
-                        set nId to id of n
-                        set nName to name of n
-                        set nBody to body of n
-                        set nModDate to modification date of n
-                        set end of outputList to {{nId, nName, nBody, "{folder_name}", nModDate as string}}
-                    end repeat
-                    return outputList
-                end tell
-            '''
-        else:
-            script = '''
-                tell application "Notes"
-                    set outputList to {}
-                    repeat with fld in folders
-                        set fldName to name of fld
-                        repeat with n in notes of fld
-                            set nId to id of n
-                            set nName to name of n
-                            set nBody to body of n
-                            set nModDate to modification date of n
-                            set end of outputList to {nId, nName, nBody, fldName, nModDate as string}
-                        end repeat
-                    end repeat
-                    return outputList
-                end tell
-            '''
-
         try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode != 0:
-                print(f"Error listing notes: {result.stderr}")
-                return []
-
-            # Parse AppleScript list output (similar to reminders)
-            output = result.stdout.strip()
-            if not output:
-                return []
-
-            notes = NotesIntegration._parse_applescript_list(output)
-            return notes
+            return _call('Notes', 'list_notes', folder_name, since) or []
 
         except Exception as e:
             print(f"Exception listing notes: {e}")
-            return []
+            return None
 
     @staticmethod
-    def _parse_applescript_list(output: str) -> List[Dict]:
-        """Parse AppleScript list output into Python dicts."""
-        # Similar to reminders parser, but for notes
-        notes = []
-
-        # Remove outer braces
-        if output.startswith('{') and output.endswith('}'):
-            output = output[1:-1]
+    async def list_notes_async(folder_name: Optional[str] = None,
+                               since: Optional[str] = None) -> Optional[List[Dict]]:
+        """Async version of list_notes."""
+        return await asyncio.to_thread(NotesIntegration.list_notes, folder_name, since)
 
-        if not output:
-            return []
+    @staticmethod
+    def store_version() -> Optional[Tuple]:
+        """
+        Change summary of the Notes database, read directly from SQLite.
+        Returns None if it can't be read (callers should then always list).
+        """
+        return _NOTES_STORE.version()
 
-        # This is a simplified parser that may need refinement
-        # For PoC, we'll return an empty list and rely on direct API calls
-        return notes
+    @staticmethod
+    async def store_version_async() -> Optional[Tuple]:
+        """Async version of store_version."""
+        return await asyncio.to_thread(NotesIntegration.store_version)
 
     @staticmethod
     def create_or_update_note(folder_name: str, note_title: str,
@@ -227,112 +571,60 @@ class NotesIntegration:
         If a note with the same title exists in the folder, update it.
         Otherwise, create a new note.
         """
-        # First, ensure the folder exists
-        ensure_folder_script = f'''
-            tell application "Notes"
-                try
-                    set targetFolder to folder "{folder_name}"
-                on error
-                    make new folder with properties {{name:"{folder_name}"}}
-                end try
-            end tell
-        '''
-
-        subprocess.run(['osascript', '-e', ensure_folder_script],
-                      capture_output=True, text=True, timeout=30)
-
-        # Now create or update the note
-        # Escape quotes in the body
-        escaped_body = note_body.replace('"', '\\"').replace('\n', '\\n')
-
-        script = f'''
-            tell application "Notes"
-                set targetFolder to folder "{folder_name}"
-                set foundNote to missing value
-
-                -- Try to find existing note with this title
-                repeat with n in notes of targetFolder
-                    if name of n is "{note_title}" then
-                        set foundNote to n
-                        exit repeat
-                    end if
-                end repeat
-
-                -- Update or create
-                if foundNote is not missing value then
-                    -- Update existing note
-                    set body of foundNote to "{escaped_body}"
-                else
-                    -- Create new note
-                    make new note at targetFolder with properties {{name:"{note_title}", body:"{escaped_body}"}}
-                end if
-
-                return true
-            end tell
-        '''
-
         try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            return result.returncode == 0
+            # First, ensure the folder exists (once per folder)
+            with NotesIntegration._known_folders_lock:
+                folder_known = folder_name in NotesIntegration._known_folders
+            if not folder_known:
+                _call('Notes', 'ensure_folder', folder_name)
+                with NotesIntegration._known_folders_lock:
+                    NotesIntegration._known_folders.add(folder_name)
+
+            # Now create or update the note
+            return bool(_call('Notes', 'create_or_update_note', folder_name,
+                              note_title, note_body))
 
         except Exception as e:
+            # The folder may have been removed; re-check it next time
+            with NotesIntegration._known_folders_lock:
+                NotesIntegration._known_folders.discard(folder_name)
             print(f"Exception creating/updating note: {e}")
             return False
 
     @staticmethod
-    def get_note(folder_name: str, note_title: str) -> Optional[Dict]:
-        """Get a specific note by folder and title."""
-        script = f'''
-            tell application "Notes"
-                set targetFolder to folder "{folder_name}"
-                repeat with n in notes of targetFolder
-                    if name of n is "{note_title}" then
-                        set nId to id of n
-                        set nName to name of n
-                        set nBody to body of n
-                        return {{nId, nName, nBody}}
-                    end if
-                end repeat
-                return missing value
-            end tell
-        '''
+    async def create_or_update_note_async(folder_name: str, note_title: str,
+                                          note_body: str) -> bool:
+        """Async version of create_or_update_note."""
+        return await asyncio.to_thread(NotesIntegration.create_or_update_note,
+                                       folder_name, note_title, note_body)
 
+    @staticmethod
+    def get_note(folder_name: str, note_title: str) -> Optional[Dict]:
+        """
+        Get a specific note by folder and title.
+        Returns dict with id, name, body, or None if not found.
+        """
         try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-            if result.returncode == 0 and result.stdout.strip():
-                output = result.stdout.strip()
-                if 'missing value' not in output:
-                    # Parse the result
-                    # This is simplified; in production, you'd parse more carefully
-                    return {'exists': True, 'content': output}
-
-            return None
+            return _call('Notes', 'get_note', folder_name, note_title)
 
         except Exception as e:
             print(f"Exception getting note: {e}")
             return None
 
+    @staticmethod
+    async def get_note_async(folder_name: str, note_title: str) -> Optional[Dict]:
+        """Async version of get_note."""
+        return await asyncio.to_thread(NotesIntegration.get_note, folder_name, note_title)
+
 
 # Test functions
 if __name__ == "__main__":
     print("Testing Reminders integration...")
-    reminders = RemindersIntegration.list_reminders()
+    reminders = RemindersIntegration.list_reminders() or []
     print(f"Found {len(reminders)} reminders")
     for r in reminders[:3]:
         print(f"  - {r.get('name')} ({r.get('list_name')})")
 
     print("\nTesting Notes integration...")
-    notes = NotesIntegration.list_notes()
+    notes = NotesIntegration.list_notes() or []
     print(f"Found {len(notes)} notes")
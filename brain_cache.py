@@ -0,0 +1,191 @@
+"""
+Brain Response Cache
+Persistent cache of brain model outputs so repeated captures skip inference.
+"""
+
+import hashlib
+import json
+import orjson
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # semantic matching is optional
+    SentenceTransformer = None
+
+
+DEFAULT_CACHE_PATH = Path.home() / ".second_brain" / "cache.sqlite"
+
+
+class ResponseCache:
+    """
+    Two-tier cache for brain responses.
+
+    Exact tier: keyed by a hash of the normalized user_text, channel and
+    mode_hint. Semantic tier (optional, needs sentence-transformers): falls
+    back to the most similar cached user_text above a cosine threshold.
+
+    Entries are only reused while the KG context they were produced against
+    is unchanged (ignoring ids and timestamps), since the model's note
+    layout depends on it, and expire after `ttl_seconds`.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: float = 7 * 24 * 3600,
+                 semantic_threshold: Optional[float] = None,
+                 embedding_model: str = "all-MiniLM-L6-v2"):
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_PATH
+        self.ttl_seconds = ttl_seconds
+        self.semantic_threshold = semantic_threshold
+
+        self._encoder = None
+        if semantic_threshold is not None and SentenceTransformer is not None:
+            self._encoder = SentenceTransformer(embedding_model)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        """Create the cache table if it doesn't exist."""
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    scope TEXT NOT NULL,
+                    context_hash TEXT NOT NULL,
+                    source_id TEXT,
+                    output BLOB NOT NULL,
+                    embedding BLOB,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_scope ON responses(scope, context_hash)")
+            self._conn.commit()
+
+    def get(self, envelope: Dict[str, Any], kg_context: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """Return a cached brain output for this envelope, or None on a miss."""
+        context_hash = _context_hash(kg_context)
+        cutoff = time.time() - self.ttl_seconds
+
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT source_id, output FROM responses
+                WHERE key = ? AND context_hash = ? AND created_at >= ?
+            """, (_envelope_key(envelope), context_hash, cutoff)).fetchone()
+
+        if row is None and self._encoder is not None:
+            row = self._semantic_lookup(envelope, context_hash, cutoff)
+
+        if row is None:
+            return None
+
+        cached_source_id, output_json = row
+        output = orjson.loads(output_json)
+
+        # Actions like delete_reminder refer to the source item; point them at this one
+        if cached_source_id and envelope.get('source_id'):
+            output = _replace_value(output, cached_source_id, envelope['source_id'])
+
+        return output
+
+    def put(self, envelope: Dict[str, Any], kg_context: Optional[Dict],
+            output: Dict[str, Any]):
+        """Store a brain output for this envelope."""
+        embedding = None
+        if self._encoder is not None:
+            embedding = self._embed(envelope.get('user_text', '')).tobytes()
+
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO responses
+                (key, scope, context_hash, source_id, output, embedding, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (_envelope_key(envelope), _envelope_scope(envelope), _context_hash(kg_context),
+                  envelope.get('source_id'), orjson.dumps(output), embedding, time.time()))
+            self._conn.commit()
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def _semantic_lookup(self, envelope: Dict[str, Any], context_hash: str,
+                         cutoff: float) -> Optional[tuple]:
+        """Find the closest cached user_text in the same scope and context."""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT source_id, output, embedding FROM responses
+                WHERE scope = ? AND context_hash = ? AND created_at >= ?
+                AND embedding IS NOT NULL
+            """, (_envelope_scope(envelope), context_hash, cutoff)).fetchall()
+
+        if not rows:
+            return None
+
+        query = self._embed(envelope.get('user_text', ''))
+        matrix = np.frombuffer(b''.join(row[2] for row in rows), dtype=np.float32)
+        scores = matrix.reshape(len(rows), -1) @ query
+
+        best = int(np.argmax(scores))
+        if scores[best] < self.semantic_threshold:
+            return None
+
+        return rows[best][0], rows[best][1]
+
+    def _embed(self, text: str):
+        """Unit-length float32 embedding, so a dot product is cosine similarity."""
+        return self._encoder.encode(_normalize_text(text), normalize_embeddings=True).astype(np.float32)
+
+
+def _normalize_text(text: str) -> str:
+    return ' '.join(text.split()).casefold()
+
+
+def _envelope_scope(envelope: Dict[str, Any]) -> str:
+    return f"{envelope.get('channel', '')}:{envelope.get('mode_hint', '')}"
+
+
+def _envelope_key(envelope: Dict[str, Any]) -> str:
+    """Hash of the envelope fields that determine the model's answer."""
+    key = {
+        'user_text': _normalize_text(envelope.get('user_text', '')),
+        'channel': envelope.get('channel'),
+        'mode_hint': envelope.get('mode_hint')
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def _context_hash(kg_context: Optional[Dict]) -> str:
+    """
+    Hash of the KG context content, ignoring node ids and timestamps.
+    Re-adding an item that is already known leaves the hash unchanged.
+    """
+    projection = {}
+    for name, nodes in (kg_context or {}).items():
+        if isinstance(nodes, list):
+            entries = {json.dumps([node.get('type'), node.get('label'), node.get('properties')],
+                                  sort_keys=True)
+                       for node in nodes if isinstance(node, dict)}
+            projection[name] = sorted(entries)
+        else:
+            projection[name] = nodes
+    return hashlib.sha256(json.dumps(projection, sort_keys=True).encode()).hexdigest()
+
+
+def _replace_value(value: Any, old: str, new: str) -> Any:
+    """Recursively replace string values equal to `old` with `new`."""
+    if isinstance(value, dict):
+        return {k: _replace_value(v, old, new) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_replace_value(v, old, new) for v in value]
+    if value == old:
+        return new
+    return value
@@ -3,14 +3,22 @@ Brain Client Module
 Interface to the local Qwen 2.5 7B-8B model via Ollama.
 """
 
+import functools
 import json
+import orjson
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 from pathlib import Path
 
+from brain_cache import ResponseCache
 
+# How long Ollama keeps the model (and its prompt cache) loaded between calls
+KEEP_ALIVE = "30m"
+
+
+@functools.lru_cache(maxsize=1)
 def load_system_prompt() -> str:
-    """Load the system prompt from the prompts directory."""
+    """Load the system prompt from the prompts directory (read once per process)."""
     prompt_path = Path(__file__).parent / "prompts" / "brain_system_prompt.md"
     with open(prompt_path, 'r') as f:
         return f.read().strip()
@@ -18,46 +26,114 @@ def load_system_prompt() -> str:
 
 class BrainClient:
     def __init__(self, model_name: str = "qwen2.5:7b-instruct",
-                 ollama_url: str = "http://localhost:11434"):
-        """Initialize the brain client."""
+                 ollama_url: str = "http://localhost:11434",
+                 cache: Optional[ResponseCache] = None, warmup: bool = True):
+        """
+        Initialize the brain client. Pass a ResponseCache to reuse outputs.
+        With warmup, the model is loaded and the system prompt prefilled now.
+        """
         self.model_name = model_name
         self.ollama_url = ollama_url
         self.system_prompt = load_system_prompt()
+        self.cache = cache
+
+        # Reuse keep-alive connections to Ollama instead of reconnecting per call
+        self._session = requests.Session()
+        self._session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=8))
+
+        # Keep these identical across calls; changing num_ctx makes Ollama reload the model
+        self.options = {"num_ctx": 4096, "num_batch": 512}
+
+        if warmup:
+            self._warmup()
+
+    def _warmup(self):
+        """
+        Load the model and prefill the system prompt so its KV cache is reused.
+
+        num_keep is left at Ollama's default: prompt_eval_count only counts
+        tokens that weren't already cached, so it can't size the system prompt
+        when the model is still warm from a previous run.
+        """
+        try:
+            response = self._session.post(
+                f"{self.ollama_url}/api/chat",
+                data=orjson.dumps({
+                    "model": self.model_name,
+                    "messages": [{"role": "system", "content": self.system_prompt}],
+                    "stream": False,
+                    "keep_alive": KEEP_ALIVE,
+                    "options": {**self.options, "num_predict": 1}
+                }),
+                headers={"Content-Type": "application/json"},
+                timeout=120
+            )
+            response.raise_for_status()
+
+        except Exception as e:
+            print(f"Warning: Brain warmup failed: {e}")
 
     def call_brain(self, envelope: Dict[str, Any],
                    kg_context: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Call the local Qwen model with the envelope and return parsed response.
         """
+        if self.cache is not None:
+            cached = self.cache.get(envelope, kg_context)
+            if cached is not None:
+                return cached
+
+        content = ''.join(self._stream_content(envelope, kg_context))
+        return self._parse_output(envelope, kg_context, content or "{}")
+
+    def _stream_content(self, envelope: Dict[str, Any],
+                        kg_context: Optional[Dict]) -> Iterator[str]:
+        """Call the Ollama chat API and yield the model's output text as it streams."""
         # Build the user message
         user_message = self._build_user_message(envelope, kg_context)
 
         # Call Ollama API
-        response = requests.post(
+        with self._session.post(
             f"{self.ollama_url}/api/chat",
-            json={
+            data=orjson.dumps({
                 "model": self.model_name,
                 "messages": [
                     {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": user_message}
                 ],
-                "stream": False,
-                "format": "json"
-            },
+                "stream": True,
+                "format": "json",
+                "keep_alive": KEEP_ALIVE,
+                "options": self.options
+            }),
+            headers={"Content-Type": "application/json"},
+            stream=True,
             timeout=120
-        )
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
 
-        if response.status_code != 200:
-            raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+                chunk = orjson.loads(line)
+                if "error" in chunk:
+                    raise Exception(f"Ollama API error: {chunk['error']}")
 
-        # Parse response
-        result = response.json()
-        message_content = result.get("message", {}).get("content", "{}")
+                yield chunk.get("message", {}).get("content", "")
 
+                if chunk.get("done"):
+                    break
+
+    def _parse_output(self, envelope: Dict[str, Any], kg_context: Optional[Dict],
+                      message_content: str) -> Dict[str, Any]:
+        """Parse and validate the model's JSON output, caching it if valid."""
         # Parse the JSON output from the model
+        cacheable = True
         try:
-            brain_output = json.loads(message_content)
-        except json.JSONDecodeError as e:
+            brain_output = orjson.loads(message_content)
+        except orjson.JSONDecodeError as e:
             # If model didn't return valid JSON, create a minimal response
             print(f"Warning: Model didn't return valid JSON: {e}")
             print(f"Raw content: {message_content}")
@@ -67,6 +143,7 @@ class BrainClient:
                 "graph_updates": [],
                 "actions": []
             }
+            cacheable = False
 
         # Validate required fields
         required_fields = ["interaction_intent", "answer", "graph_updates", "actions"]
@@ -74,6 +151,9 @@ class BrainClient:
             if field not in brain_output:
                 brain_output[field] = [] if field in ["graph_updates", "actions"] else ""
 
+        if self.cache is not None and cacheable:
+            self.cache.put(envelope, kg_context, brain_output)
+
         return brain_output
 
     def _build_user_message(self, envelope: Dict, kg_context: Optional[Dict]) -> str:
@@ -82,7 +162,7 @@ class BrainClient:
             "envelope": envelope,
             "kg_context": kg_context or {}
         }
-        return json.dumps(message, indent=2)
+        return orjson.dumps(message).decode()
 
 
 # Example usage
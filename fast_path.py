@@ -0,0 +1,202 @@
+"""
+Fast Path Module
+Handle trivially-parseable grocery reminders without calling the brain model.
+"""
+
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Grocery categories, in note order (same list as the system prompt)
+CATEGORIES = [
+    "Produce",
+    "Bakery",
+    "Meat / Seafood",
+    "Dairy & Eggs",
+    "Frozen",
+    "Pantry & Dry Goods",
+    "Canned & Jarred",
+    "Condiments & Sauces",
+    "Snacks & Sweets",
+    "Beverages",
+    "Household & Cleaning",
+    "Personal Care & Pharmacy",
+    "Uncategorized / Other",
+]
+
+# Common items (singular, lowercase) and their category. Anything not listed
+# sends the reminder to the model instead.
+ITEM_CATEGORIES = {
+    # Produce
+    "apple": "Produce", "banana": "Produce", "orange": "Produce", "lemon": "Produce",
+    "lime": "Produce", "avocado": "Produce", "tomato": "Produce", "potato": "Produce",
+    "onion": "Produce", "garlic": "Produce", "carrot": "Produce", "celery": "Produce",
+    "lettuce": "Produce", "spinach": "Produce", "broccoli": "Produce", "cucumber": "Produce",
+    "bell pepper": "Produce", "mushroom": "Produce", "basil": "Produce", "cilantro": "Produce",
+    "parsley": "Produce", "ginger": "Produce", "grape": "Produce", "strawberry": "Produce",
+    "blueberry": "Produce", "zucchini": "Produce", "kale": "Produce",
+    # Bakery
+    "bread": "Bakery", "bagel": "Bakery", "tortilla": "Bakery", "bun": "Bakery",
+    "croissant": "Bakery", "pita": "Bakery",
+    # Meat / Seafood
+    "chicken": "Meat / Seafood", "chicken breast": "Meat / Seafood", "beef": "Meat / Seafood",
+    "ground beef": "Meat / Seafood", "pork": "Meat / Seafood", "bacon": "Meat / Seafood",
+    "sausage": "Meat / Seafood", "turkey": "Meat / Seafood", "salmon": "Meat / Seafood",
+    "shrimp": "Meat / Seafood", "tuna steak": "Meat / Seafood",
+    # Dairy & Eggs
+    "milk": "Dairy & Eggs", "egg": "Dairy & Eggs", "butter": "Dairy & Eggs",
+    "cheese": "Dairy & Eggs", "yogurt": "Dairy & Eggs", "cream": "Dairy & Eggs",
+    "sour cream": "Dairy & Eggs", "cream cheese": "Dairy & Eggs", "parmesan": "Dairy & Eggs",
+    "mozzarella": "Dairy & Eggs",
+    # Frozen
+    "ice cream": "Frozen", "frozen peas": "Frozen", "frozen pizza": "Frozen",
+    "frozen vegetables": "Frozen",
+    # Pantry & Dry Goods
+    "pasta": "Pantry & Dry Goods", "rice": "Pantry & Dry Goods", "flour": "Pantry & Dry Goods",
+    "sugar": "Pantry & Dry Goods", "salt": "Pantry & Dry Goods", "pepper": "Pantry & Dry Goods",
+    "oats": "Pantry & Dry Goods", "oatmeal": "Pantry & Dry Goods", "cereal": "Pantry & Dry Goods",
+    "olive oil": "Pantry & Dry Goods", "vegetable oil": "Pantry & Dry Goods",
+    "baking soda": "Pantry & Dry Goods", "baking powder": "Pantry & Dry Goods",
+    "quinoa": "Pantry & Dry Goods", "lentil": "Pantry & Dry Goods",
+    # Canned & Jarred
+    "canned tomato": "Canned & Jarred", "crushed tomato": "Canned & Jarred",
+    "tomato paste": "Canned & Jarred", "black bean": "Canned & Jarred",
+    "chickpea": "Canned & Jarred", "tuna": "Canned & Jarred", "broth": "Canned & Jarred",
+    "chicken broth": "Canned & Jarred", "peanut butter": "Canned & Jarred",
+    "jam": "Canned & Jarred",
+    # Condiments & Sauces
+    "ketchup": "Condiments & Sauces", "mustard": "Condiments & Sauces",
+    "mayonnaise": "Condiments & Sauces", "mayo": "Condiments & Sauces",
+    "soy sauce": "Condiments & Sauces", "hot sauce": "Condiments & Sauces",
+    "vinegar": "Condiments & Sauces", "salsa": "Condiments & Sauces",
+    "pasta sauce": "Condiments & Sauces", "honey": "Condiments & Sauces",
+    # Snacks & Sweets
+    "chip": "Snacks & Sweets", "cracker": "Snacks & Sweets", "cookie": "Snacks & Sweets",
+    "chocolate": "Snacks & Sweets", "popcorn": "Snacks & Sweets", "pretzel": "Snacks & Sweets",
+    "nut": "Snacks & Sweets", "almond": "Snacks & Sweets",
+    # Beverages
+    "coffee": "Beverages", "tea": "Beverages", "juice": "Beverages",
+    "orange juice": "Beverages", "water": "Beverages", "sparkling water": "Beverages",
+    "soda": "Beverages", "beer": "Beverages", "wine": "Beverages",
+    # Household & Cleaning
+    "paper towel": "Household & Cleaning", "toilet paper": "Household & Cleaning",
+    "dish soap": "Household & Cleaning", "laundry detergent": "Household & Cleaning",
+    "trash bag": "Household & Cleaning", "sponge": "Household & Cleaning",
+    "aluminum foil": "Household & Cleaning",
+    # Personal Care & Pharmacy
+    "toothpaste": "Personal Care & Pharmacy", "shampoo": "Personal Care & Pharmacy",
+    "conditioner": "Personal Care & Pharmacy", "deodorant": "Personal Care & Pharmacy",
+    "soap": "Personal Care & Pharmacy", "sunscreen": "Personal Care & Pharmacy",
+    "ibuprofen": "Personal Care & Pharmacy", "vitamin": "Personal Care & Pharmacy",
+}
+
+_BUY_RE = re.compile(r"^\s*(?:buy|get|pick up)\s+(?P<items>.+?)[\s.!]*$", re.IGNORECASE)
+_SPLIT_RE = re.compile(r"\s*(?:,|\band\b)\s*", re.IGNORECASE)
+_ARTICLE_RE = re.compile(r"^(?:some|a|an|the|more)\s+", re.IGNORECASE)
+
+
+class FastPath:
+    """
+    Rule-based front door for simple grocery reminders.
+
+    Handles reminders like "Buy pasta, rice, and tomatoes" when every item
+    is in ITEM_CATEGORIES, producing the same output shape as the brain
+    model. Anything else returns None so the caller falls back to the model.
+    """
+
+    def try_handle(self, envelope: Dict[str, Any],
+                   kg_context: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """Return a brain-shaped output for a trivial reminder, or None."""
+        if envelope.get('channel') != 'reminder':
+            return None
+
+        match = _BUY_RE.match(envelope.get('user_text', ''))
+        if not match:
+            return None
+
+        new_items = []
+        for raw in _SPLIT_RE.split(match.group('items')):
+            if not raw:
+                continue
+            item = _lookup_item(_ARTICLE_RE.sub('', raw.strip()))
+            if item is None:
+                return None
+            new_items.append(item)
+
+        if not new_items:
+            return None
+
+        # The note is rewritten in full, so keep the items already known
+        known = {}
+        for node in (kg_context or {}).get('grocery_items', []):
+            label = node.get('label')
+            if label:
+                category = (node.get('properties') or {}).get('category', "Uncategorized / Other")
+                known.setdefault(label.casefold(), (label, category))
+
+        graph_updates = []
+        for label, category in new_items:
+            if label.casefold() in known:
+                continue
+            known[label.casefold()] = (label, category)
+            graph_updates.append({
+                "op_type": "create_node",
+                "payload": {
+                    "type": "GroceryItem",
+                    "label": label,
+                    "properties": {"category": category}
+                }
+            })
+
+        actions = [{
+            "action_type": "update_apple_note",
+            "arguments": {
+                "target_folder": "To Buy",
+                "target_title": "Groceries",
+                "layout": {"sections": _build_sections(known.values())}
+            }
+        }]
+        if envelope.get('source_id'):
+            actions.append({
+                "action_type": "delete_reminder",
+                "arguments": {"source_id": envelope['source_id']}
+            })
+
+        return {
+            "interaction_intent": "store_only",
+            "answer": "",
+            "graph_updates": graph_updates,
+            "actions": actions
+        }
+
+
+def _lookup_item(text: str) -> Optional[Tuple[str, str]]:
+    """Return (label, category) for a known item, trying singular forms."""
+    name = ' '.join(text.split()).lower()
+    candidates = [name]
+    if name.endswith('es'):
+        candidates.append(name[:-2])
+    if name.endswith('s'):
+        candidates.append(name[:-1])
+
+    for candidate in candidates:
+        category = ITEM_CATEGORIES.get(candidate)
+        if category:
+            return candidate.capitalize(), category
+
+    return None
+
+
+def _build_sections(items) -> List[Dict[str, Any]]:
+    """Group (label, category) pairs into note sections in category order."""
+    by_category: Dict[str, List[str]] = {}
+    for label, category in items:
+        if category not in CATEGORIES:
+            category = "Uncategorized / Other"
+        by_category.setdefault(category, []).append(label)
+
+    return [
+        {"name": category, "items": [{"text": label} for label in by_category[category]]}
+        for category in CATEGORIES
+        if category in by_category
+    ]
@@ -1,26 +1,86 @@
 """
 Knowledge Graph Database Layer
 Simple SQLite-based graph database for storing nodes and edges.
+
+Node and edge properties are stored as MessagePack BLOBs. Databases created
+before that hold JSON TEXT; those rows are still read (SQLite keeps each
+value's storage class) and are rewritten as MessagePack when next updated.
 """
 
 import sqlite3
-import json
+import msgspec
+import orjson
+import threading
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+_MSGPACK_DECODER = msgspec.msgpack.Decoder()
+
+
 class KnowledgeGraph:
+    # Hot statements, kept as constants so sqlite3's statement cache
+    # (keyed by SQL text) always hits
+    _SQL_INSERT_NODE = """
+        INSERT INTO nodes (id, type, label, properties, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    _SQL_INSERT_EDGE = """
+        INSERT INTO edges (id, type, from_id, to_id, properties, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    _SQL_GET_NODE = """
+        SELECT id, type, label, properties, created_at, updated_at
+        FROM nodes WHERE id = ?
+    """
+    _SQL_GET_LABEL_PROPERTIES = "SELECT label, properties FROM nodes WHERE id = ?"
+    _SQL_FIND_BY_TYPE = """
+        SELECT id, type, label, properties, created_at, updated_at
+        FROM nodes WHERE type = ?
+        ORDER BY updated_at DESC
+        LIMIT ?
+    """
+
     def __init__(self, db_path: str = "knowledge_graph.db"):
         """Initialize the knowledge graph database."""
         self.db_path = db_path
+
+        # One shared connection in autocommit mode, guarded by a lock since the
+        # orchestrator's poll thread and Flask handlers both use it
+        self._conn = sqlite3.connect(db_path, check_same_thread=False,
+                                     isolation_level=None)
+        self._lock = threading.Lock()
+
+        # Short-lived cache of get_kg_context results, cleared on node writes.
+        # _ctx_generation guards against storing a result read before a write.
+        self._ctx_cache: Dict[Tuple[str, int], Tuple[float, Dict]] = {}
+        self._ctx_ttl = 2.0
+        self._ctx_generation = 0
+
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-20000")
+
         self._init_db()
 
+    def _invalidate_context(self):
+        """Drop cached KG context after a node write."""
+        self._ctx_generation += 1
+        self._ctx_cache.clear()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
     def _init_db(self):
         """Create tables if they don't exist."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
 
         # Create nodes table
         cursor.execute("""
@@ -28,7 +88,7 @@ class KnowledgeGraph:
                 id TEXT PRIMARY KEY,
                 type TEXT NOT NULL,
                 label TEXT,
-                properties TEXT,
+                properties BLOB,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL
             )
@@ -41,7 +101,7 @@ class KnowledgeGraph:
                 type TEXT NOT NULL,
                 from_id TEXT NOT NULL,
                 to_id TEXT NOT NULL,
-                properties TEXT,
+                properties BLOB,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
                 FOREIGN KEY (from_id) REFERENCES nodes (id),
@@ -49,13 +109,35 @@ class KnowledgeGraph:
             )
         """)
 
-        # Create indexes for faster lookups
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes(type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_from ON edges(from_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_to ON edges(to_id)")
+        # Source items (reminders, notes) already handled by the orchestrator,
+        # so a restart doesn't send them through the brain again
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS processed (
+                source_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                content_hash TEXT,
+                ts REAL NOT NULL
+            )
+        """)
 
-        conn.commit()
-        conn.close()
+        # Create indexes for faster lookups. (type, updated_at) serves
+        # find_nodes_by_type's filter and ORDER BY ... LIMIT as a range scan,
+        # and covers plain type lookups, so the old type-only index is dropped
+        cursor.execute("DROP INDEX IF EXISTS idx_nodes_type")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_nodes_type_updated ON nodes(type, updated_at DESC)")
+        # Edge traversals filter on an endpoint and usually the edge type; the
+        # composites also serve endpoint-only lookups
+        cursor.execute("DROP INDEX IF EXISTS idx_edges_from")
+        cursor.execute("DROP INDEX IF EXISTS idx_edges_to")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_edges_from_type ON edges(from_id, type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_to_type ON edges(to_id, type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_edges_type ON edges(type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_processed_kind ON processed(kind, ts)")
+
+        # Refresh planner statistics
+        cursor.execute("ANALYZE")
 
     def create_node(self, node_type: str, label: str = None,
                    properties: Dict = None, node_id: str = None) -> str:
@@ -63,74 +145,57 @@ class KnowledgeGraph:
         if node_id is None:
             node_id = str(uuid.uuid4())
 
-        now = datetime.utcnow().isoformat()
-        properties_json = json.dumps(properties or {})
-
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO nodes (id, type, label, properties, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (node_id, node_type, label, properties_json, now, now))
+        now = _utc_now()
+        properties_blob = _encode_properties(properties)
 
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._conn.execute(self._SQL_INSERT_NODE,
+                               (node_id, node_type, label, properties_blob, now, now))
+            self._invalidate_context()
 
         return node_id
 
     def update_node(self, node_id: str, label: str = None,
                    properties: Dict = None, merge_properties: bool = True):
-        """Update an existing node."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get existing node
-        cursor.execute("SELECT properties FROM nodes WHERE id = ?", (node_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            conn.close()
-            raise ValueError(f"Node {node_id} not found")
-
-        # Merge or replace properties
-        if merge_properties and properties:
-            existing_props = json.loads(row[0])
-            existing_props.update(properties)
-            properties = existing_props
-
-        now = datetime.utcnow().isoformat()
-        properties_json = json.dumps(properties or {})
-
-        # Update node
-        if label is not None:
-            cursor.execute("""
-                UPDATE nodes
-                SET label = ?, properties = ?, updated_at = ?
-                WHERE id = ?
-            """, (label, properties_json, now, node_id))
-        else:
-            cursor.execute("""
-                UPDATE nodes
-                SET properties = ?, updated_at = ?
-                WHERE id = ?
-            """, (properties_json, now, node_id))
-
-        conn.commit()
-        conn.close()
+        """Update an existing node. Does nothing if the node would be unchanged."""
+        with self._lock:
+            # Get existing node
+            row = self._conn.execute(self._SQL_GET_LABEL_PROPERTIES, (node_id,)).fetchone()
+
+            if not row:
+                raise ValueError(f"Node {node_id} not found")
+
+            # Merge or replace properties
+            existing = _decode_properties(row[1])
+            properties = _merge_properties(existing, properties, merge_properties)
+
+            # Skip the write (and keep updated_at) for a no-op update
+            if properties == existing and label in (None, row[0]):
+                return
+
+            now = _utc_now()
+            properties_blob = _encode_properties(properties)
+
+            # Update node
+            if label is not None:
+                self._conn.execute("""
+                    UPDATE nodes
+                    SET label = ?, properties = ?, updated_at = ?
+                    WHERE id = ?
+                """, (label, properties_blob, now, node_id))
+            else:
+                self._conn.execute("""
+                    UPDATE nodes
+                    SET properties = ?, updated_at = ?
+                    WHERE id = ?
+                """, (properties_blob, now, node_id))
+
+            self._invalidate_context()
 
     def get_node(self, node_id: str) -> Optional[Dict]:
         """Retrieve a node by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT id, type, label, properties, created_at, updated_at
-            FROM nodes WHERE id = ?
-        """, (node_id,))
-
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute(self._SQL_GET_NODE, (node_id,)).fetchone()
 
         if not row:
             return None
@@ -139,7 +204,7 @@ class KnowledgeGraph:
             'id': row[0],
             'type': row[1],
             'label': row[2],
-            'properties': json.loads(row[3]),
+            'properties': _decode_properties(row[3]),
             'created_at': row[4],
             'updated_at': row[5]
         }
@@ -150,44 +215,67 @@ class KnowledgeGraph:
         if edge_id is None:
             edge_id = str(uuid.uuid4())
 
-        now = datetime.utcnow().isoformat()
-        properties_json = json.dumps(properties or {})
+        now = _utc_now()
+        properties_blob = _encode_properties(properties)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO edges (id, type, from_id, to_id, properties, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (edge_id, edge_type, from_id, to_id, properties_json, now, now))
-
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._conn.execute(self._SQL_INSERT_EDGE,
+                               (edge_id, edge_type, from_id, to_id, properties_blob, now, now))
 
         return edge_id
 
     def find_nodes_by_type(self, node_type: str, limit: int = 100) -> List[Dict]:
         """Find nodes by type."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            rows = self._conn.execute(self._SQL_FIND_BY_TYPE, (node_type, limit)).fetchall()
 
-        cursor.execute("""
-            SELECT id, type, label, properties, created_at, updated_at
-            FROM nodes WHERE type = ?
-            ORDER BY updated_at DESC
-            LIMIT ?
-        """, (node_type, limit))
+        return [{
+            'id': row[0],
+            'type': row[1],
+            'label': row[2],
+            'properties': _decode_properties(row[3]),
+            'created_at': row[4],
+            'updated_at': row[5]
+        } for row in rows]
 
-        rows = cursor.fetchall()
-        conn.close()
+    def neighbors(self, node_id: str, edge_type: str = None,
+                  direction: str = "out") -> List[Dict]:
+        """
+        Find nodes connected to a node, optionally through one edge type.
+
+        direction is "out" (node_id -> neighbor) or "in" (neighbor -> node_id).
+        Each result is a node dict plus the connecting 'edge_id' and 'edge_type'.
+        """
+        if direction == "out":
+            near, far = "from_id", "to_id"
+        elif direction == "in":
+            near, far = "to_id", "from_id"
+        else:
+            raise ValueError(f"Unknown direction: {direction}")
+
+        sql = f"""
+            SELECT n.id, n.type, n.label, n.properties, n.created_at, n.updated_at,
+                   e.id, e.type
+            FROM edges e JOIN nodes n ON n.id = e.{far}
+            WHERE e.{near} = ?
+        """
+        params = [node_id]
+        if edge_type is not None:
+            sql += " AND e.type = ?"
+            params.append(edge_type)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
 
         return [{
             'id': row[0],
             'type': row[1],
             'label': row[2],
-            'properties': json.loads(row[3]),
+            'properties': _decode_properties(row[3]),
             'created_at': row[4],
-            'updated_at': row[5]
+            'updated_at': row[5],
+            'edge_id': row[6],
+            'edge_type': row[7]
         } for row in rows]
 
     def apply_graph_update(self, operation: Dict) -> str:
@@ -232,15 +320,248 @@ class KnowledgeGraph:
         else:
             raise ValueError(f"Unknown operation type: {op_type}")
 
+    def apply_graph_updates(self, operations: List[Dict],
+                            now: Optional[str] = None) -> List[Dict]:
+        """
+        Apply a batch of graph update operations in a single transaction.
+
+        Rows are bucketed by operation type and written with executemany, with
+        one timestamp for the whole batch (`now`, an ISO-8601 string, or the
+        current time). Returns one result per operation, in order:
+        {'success': True, 'id': ...} or {'success': False, 'error': ...}.
+        """
+        now = now or _utc_now()
+        results: List[Optional[Dict]] = [None] * len(operations)
+
+        node_rows: Dict[str, List] = {}     # node_id -> [id, type, label, properties]
+        edge_rows: Dict[str, List] = {}     # edge_id -> [id, type, from_id, to_id, properties]
+        node_ops: Dict[str, int] = {}       # node_id -> index of its create_node op
+        edge_ops: Dict[str, int] = {}
+        updates = []                        # (index, payload)
+
+        for i, operation in enumerate(operations):
+            op_type = operation.get('op_type')
+            payload = operation.get('payload', {}) or {}
+
+            if op_type == 'create_node':
+                node_id = payload.get('id') or str(uuid.uuid4())
+                if not payload.get('type'):
+                    results[i] = {'success': False, 'error': 'Node type is required'}
+                elif node_id in node_rows:
+                    results[i] = {'success': False, 'error': f"Node {node_id} already exists"}
+                else:
+                    node_rows[node_id] = [node_id, payload.get('type'), payload.get('label'),
+                                          payload.get('properties') or {}]
+                    node_ops[node_id] = i
+
+            elif op_type == 'update_node':
+                updates.append((i, payload))
+
+            elif op_type == 'create_edge':
+                edge_id = payload.get('id') or str(uuid.uuid4())
+                if not (payload.get('type') and payload.get('from_id') and payload.get('to_id')):
+                    results[i] = {'success': False, 'error': 'Edge type, from_id and to_id are required'}
+                elif edge_id in edge_rows:
+                    results[i] = {'success': False, 'error': f"Edge {edge_id} already exists"}
+                else:
+                    edge_rows[edge_id] = [edge_id, payload.get('type'), payload.get('from_id'),
+                                          payload.get('to_id'), payload.get('properties') or {}]
+                    edge_ops[edge_id] = i
+
+            else:
+                results[i] = {'success': False, 'error': f"Unknown operation type: {op_type}"}
+
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    node_updates = self._stage_batch(node_rows, edge_rows, node_ops,
+                                                     edge_ops, updates, results)
+
+                    self._conn.executemany(self._SQL_INSERT_NODE, [
+                        (node_id, node_type, label, _encode_properties(props), now, now)
+                        for node_id, node_type, label, props in node_rows.values()])
+
+                    self._conn.executemany("""
+                        UPDATE nodes
+                        SET label = COALESCE(?, label), properties = ?, updated_at = ?
+                        WHERE id = ?
+                    """, [(label, _encode_properties(props), now, node_id)
+                          for node_id, (label, props) in node_updates.items()])
+
+                    self._conn.executemany(self._SQL_INSERT_EDGE, [
+                        (edge_id, edge_type, from_id, to_id, _encode_properties(props), now, now)
+                        for edge_id, edge_type, from_id, to_id, props in edge_rows.values()])
+
+                    self._conn.execute("COMMIT")
+                    if node_rows or node_updates:
+                        self._invalidate_context()
+
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+
+        except Exception as e:
+            # Fall back to applying operations one at a time so a single bad
+            # operation doesn't fail the whole batch
+            print(f"Batched graph update failed ({e}); applying individually")
+            return [self._apply_one(operation) for operation in operations]
+
+        for node_id, i in node_ops.items():
+            if results[i] is None:
+                results[i] = {'success': True, 'id': node_id}
+        for edge_id, i in edge_ops.items():
+            if results[i] is None:
+                results[i] = {'success': True, 'id': edge_id}
+
+        return results
+
+    def _stage_batch(self, node_rows: Dict[str, List], edge_rows: Dict[str, List],
+                     node_ops: Dict[str, int], edge_ops: Dict[str, int],
+                     updates: List, results: List[Optional[Dict]]) -> Dict[str, List]:
+        """
+        Resolve a batch against existing rows (caller holds the lock).
+
+        Drops creates whose ids already exist and merges update_node payloads
+        into either a pending create or the stored node. Returns pending node
+        updates as node_id -> [label, properties], leaving out updates that
+        would not change the stored node.
+        """
+        update_ids = [payload.get('id') for _, payload in updates if payload.get('id')]
+        lookup_ids = list(node_rows) + update_ids
+        existing_nodes = {}
+        if lookup_ids:
+            placeholders = ','.join('?' * len(lookup_ids))
+            existing_nodes = {
+                node_id: (label, properties)
+                for node_id, label, properties in self._conn.execute(
+                    f"SELECT id, label, properties FROM nodes WHERE id IN ({placeholders})",
+                    lookup_ids)
+            }
+
+        for node_id in [node_id for node_id in node_rows if node_id in existing_nodes]:
+            results[node_ops[node_id]] = {'success': False, 'error': f"Node {node_id} already exists"}
+            del node_rows[node_id]
+
+        if edge_rows:
+            placeholders = ','.join('?' * len(edge_rows))
+            for (edge_id,) in self._conn.execute(
+                    f"SELECT id FROM edges WHERE id IN ({placeholders})", list(edge_rows)):
+                results[edge_ops[edge_id]] = {'success': False, 'error': f"Edge {edge_id} already exists"}
+                del edge_rows[edge_id]
+
+        node_updates: Dict[str, List] = {}
+        existing_properties: Dict[str, Dict] = {}
+        for i, payload in updates:
+            node_id = payload.get('id')
+            properties = payload.get('properties')
+            merge = payload.get('merge', True)
+
+            if node_id in node_rows:
+                # Node created earlier in this batch; fold the update into its row
+                row = node_rows[node_id]
+                if payload.get('label') is not None:
+                    row[2] = payload.get('label')
+                row[3] = _merge_properties(row[3], properties, merge)
+            elif node_id in node_updates:
+                pending = node_updates[node_id]
+                if payload.get('label') is not None:
+                    pending[0] = payload.get('label')
+                pending[1] = _merge_properties(pending[1], properties, merge)
+            elif node_id in existing_nodes:
+                existing_properties[node_id] = _decode_properties(existing_nodes[node_id][1])
+                node_updates[node_id] = [
+                    payload.get('label'),
+                    _merge_properties(existing_properties[node_id], properties, merge)
+                ]
+            else:
+                results[i] = {'success': False, 'error': f"Node {node_id} not found"}
+                continue
+
+            results[i] = {'success': True, 'id': node_id}
+
+        # Drop no-op updates so they don't rewrite the row or bump updated_at
+        for node_id, (label, properties) in list(node_updates.items()):
+            if (properties == existing_properties[node_id]
+                    and label in (None, existing_nodes[node_id][0])):
+                del node_updates[node_id]
+
+        return node_updates
+
+    def _apply_one(self, operation: Dict) -> Dict:
+        """Apply a single operation, returning a batch-style result."""
+        try:
+            return {'success': True, 'id': self.apply_graph_update(operation)}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def mark_processed(self, source_id: str, kind: str, content_hash: str = None):
+        """Record that a source item has been processed."""
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO processed (source_id, kind, content_hash, ts)
+                VALUES (?, ?, ?, ?)
+            """, (source_id, kind, content_hash, time.time()))
+
+    def load_processed(self, kind: str, limit: int = 100000) -> List[str]:
+        """Return the most recently processed source ids of a kind, oldest first."""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT source_id FROM processed WHERE kind = ?
+                ORDER BY ts DESC
+                LIMIT ?
+            """, (kind, limit)).fetchall()
+
+        return [row[0] for row in reversed(rows)]
+
     def get_kg_context(self, context_type: str = "grocery", limit: int = 50) -> Dict:
         """
         Get relevant KG context for the model.
         For PoC, just return recent grocery items.
+
+        Results are cached for a couple of seconds (or until the next node
+        write), so a burst of envelopes shares one query.
         """
+        key = (context_type, limit)
+        cached = self._ctx_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self._ctx_ttl:
+            return cached[1]
+
+        generation = self._ctx_generation
+        context = {}
         if context_type == "grocery":
             items = self.find_nodes_by_type("GroceryItem", limit=limit)
-            return {
+            context = {
                 "grocery_items": items
             }
 
+        if generation == self._ctx_generation:
+            self._ctx_cache[key] = (time.monotonic(), context)
+
+        return context
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _encode_properties(properties: Optional[Dict]) -> bytes:
+    return _MSGPACK_ENCODER.encode(properties or {})
+
+
+def _decode_properties(value) -> Dict:
+    """Decode a stored properties value: MessagePack bytes, or legacy JSON text."""
+    if value is None:
         return {}
+    if isinstance(value, str):
+        return orjson.loads(value)
+    return _MSGPACK_DECODER.decode(value)
+
+
+def _merge_properties(existing: Dict, properties: Optional[Dict], merge: bool) -> Dict:
+    """Merge new properties into existing ones, or replace them."""
+    if merge and properties:
+        merged = dict(existing)
+        merged.update(properties)
+        return merged
+    return properties or {}
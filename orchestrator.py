@@ -3,32 +3,177 @@ Orchestrator Service
 Main service that watches Reminders/Notes, calls brain, and executes actions.
 """
 
+import os
+import re
 import time
-import json
-import hashlib
+import atexit
+import functools
+import queue
+import orjson
+import xxhash
 from datetime import datetime, timezone
-from typing import Dict, List, Set, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 from flask import Flask, request, jsonify
+from waitress import serve
 import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from selectolax.lexbor import LexborHTMLParser
 
 from kg_database import KnowledgeGraph
 from brain_client import BrainClient
+from brain_cache import ResponseCache
+from fast_path import FastPath
 from apple_integrations import RemindersIntegration, NotesIntegration
-from action_handlers import ActionExecutor
+from action_handlers import get_executor
+
+
+# Whitespace cleanup for extracted page text, in one pass: any whitespace run
+# (including &nbsp; and other Unicode spaces) containing a line break or a
+# double space (column/cell gaps) becomes a single newline, which trims lines,
+# drops blank ones and splits columns apart. _LINE_BREAKS are the characters
+# str.splitlines() breaks on.
+_LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+_CLEAN_RE = re.compile(f'[^\\S{_LINE_BREAKS}]*(?:[{_LINE_BREAKS}]|  )\\s*')
+
+# Notes that might be recipes: mention ingredients or contain list markers
+_RECIPE_RE = re.compile(r'ingredient|[•\-*]', re.IGNORECASE)
+
+# Largest page body read by _fetch_url_text; anything past it is ignored
+MAX_URL_BYTES = 2 * 1024 * 1024
+
+# Reminders/Notes data directories; changes here trigger an immediate rescan.
+# (path, recursive) - the Reminders stores live a few levels down.
+_GROUP_CONTAINERS = Path.home() / "Library" / "Group Containers"
+WATCH_PATHS = [
+    (_GROUP_CONTAINERS / "group.com.apple.reminders", True),
+    (_GROUP_CONTAINERS / "group.com.apple.notes", False),
+]
+
+# Quiet period used to coalesce a burst of file events into one rescan
+DEBOUNCE_SECONDS = 0.5
+
+# Content types _fetch_url_text will read; anything else is rejected unread
+TEXT_CONTENT_TYPES = {'text/html', 'application/xhtml+xml', 'text/plain'}
+
+# Listings filtered by modification date miss items synced from another device
+# with an older date, so list everything every this many listings (and
+# whenever the store's row count changes)
+FULL_LISTING_EVERY = 20
+
+# Processed reminder ids kept in memory (and reloaded on startup)
+MAX_PROCESSED_REMINDERS = 100000
+
+
+class _BoundedSet:
+    """Set of ids that forgets the least recently added once it hits `maxsize`."""
+
+    def __init__(self, maxsize: int, items=()):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        for item in items:
+            self.add(item)
+
+    def add(self, item: str):
+        self._items[item] = None
+        self._items.move_to_end(item)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class _ListingState:
+    """
+    What the last successful listing of an app saw: the store version (see
+    store_version()) and the newest modification date, used as the `since`
+    watermark for the next listing.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.watermark: Optional[str] = None
+        self.filtered_listings = 0
+        self.held = False
+
+    def unchanged(self, version) -> bool:
+        """True if the store hasn't changed since the last listing."""
+        return not self.held and version is not None and version == self.version
+
+    def since(self, version) -> Optional[str]:
+        """Watermark for the next listing, or None to list everything."""
+        if self.filtered_listings >= FULL_LISTING_EVERY:
+            return None
+        # New or removed rows may carry an older date (e.g. synced from a phone)
+        if version is not None and self.version is not None \
+                and _row_counts(version) != _row_counts(self.version):
+            return None
+        return self.watermark
+
+    def record(self, version, items: List[Dict], since: Optional[str],
+               held: List[Dict] = ()):
+        """
+        Remember a successful listing made with `since`. Items in `held` were
+        skipped for now (still in flight), so the next listing includes them.
+        """
+        self.version = version
+        self.watermark = _newest_modification(items, self.watermark)
+        self.filtered_listings = 0 if since is None else self.filtered_listings + 1
+
+        # Keep the watermark at or before the held items and list again next
+        # pass even if the store doesn't change in the meantime
+        self.held = bool(held)
+        held_dates = [item['modification_date'] for item in held if item.get('modification_date')]
+        if held_dates and self.watermark:
+            self.watermark = min(self.watermark, min(held_dates))
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Queue a rescan whenever a watched store changes."""
+
+    def __init__(self, changes: queue.Queue):
+        self.changes = changes
+
+    def on_modified(self, event):
+        self.changes.put_nowait(event.src_path)
+
+    def on_created(self, event):
+        self.changes.put_nowait(event.src_path)
 
 
 class InteractionLogger:
-    """Log all interactions to JSONL file."""
+    """
+    Log all interactions to JSONL file.
+
+    Entries are serialized by the caller and appended by a background thread,
+    which batches writes and fsyncs at most once per second. Call stop() (also
+    run at exit) to flush what's queued.
+    """
+
+    BATCH_SIZE = 256
+    FSYNC_INTERVAL = 1.0
 
     def __init__(self, log_path: str = "interactions.jsonl"):
         self.log_path = log_path
+        self._file = open(log_path, 'ab', buffering=1024 * 1024)
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
 
     def log_interaction(self, envelope: Dict, model_output: Dict,
                        execution_results: Dict, errors: Optional[List] = None):
-        """Log a single interaction."""
+        """Queue a single interaction for writing."""
         log_entry = {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'envelope': envelope,
@@ -37,8 +182,51 @@ class InteractionLogger:
             'errors': errors or []
         }
 
-        with open(self.log_path, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        self._queue.put_nowait(orjson.dumps(log_entry) + b'\n')
+
+    def stop(self):
+        """Write out queued entries and close the log file."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _write_loop(self):
+        last_sync = time.monotonic()
+        dirty = False
+
+        while True:
+            try:
+                entry = self._queue.get(timeout=self.FSYNC_INTERVAL)
+            except queue.Empty:
+                entry = b''
+
+            # Coalesce whatever else is already queued into one write
+            batch = [entry]
+            while entry is not None and len(batch) < self.BATCH_SIZE:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(entry)
+
+            stopping = batch[-1] is None
+            data = b''.join(item for item in batch if item)
+            if data:
+                self._file.write(data)
+                dirty = True
+
+            # Flush once the queue is idle so the log stays readable
+            if dirty and (stopping or self._queue.empty()):
+                self._file.flush()
+                now = time.monotonic()
+                if stopping or now - last_sync >= self.FSYNC_INTERVAL:
+                    os.fsync(self._file.fileno())
+                    last_sync = now
+                    dirty = False
+
+            if stopping:
+                self._file.close()
+                return
 
 
 class Orchestrator:
@@ -47,18 +235,55 @@ class Orchestrator:
     def __init__(self, poll_interval: int = 10):
         self.poll_interval = poll_interval
         self.kg = KnowledgeGraph()
-        self.brain = BrainClient()
-        self.executor = ActionExecutor()
+        self.brain = BrainClient(cache=ResponseCache())
+        self.fast_path = FastPath()
+        self.executor = get_executor()
         self.logger = InteractionLogger()
 
-        # Track processed items to avoid re-processing
-        self.processed_reminders: Set[str] = set()
-        self.processed_notes: Dict[str, str] = {}  # note_id -> content_hash
+        # Shared HTTP session for URL captures, so repeat hosts reuse connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        # Only advertise encodings urllib3 can decode (br needs the brotli package)
+        self._http.headers.update(make_headers(accept_encoding=True))
+        self._http.headers['User-Agent'] = 'second-brain-poc/0.1'
+
+        # Track processed items to avoid re-processing. Reminders are also
+        # persisted in the KG database so a restart doesn't reprocess them.
+        self.processed_reminders = _BoundedSet(
+            MAX_PROCESSED_REMINDERS,
+            self.kg.load_processed('reminder', limit=MAX_PROCESSED_REMINDERS))
+        self.processed_notes: Dict[str, int] = {}  # note_id -> content_hash
+        # Every note looked at, processed or not: note_id -> (modification_date, content_hash)
+        self._seen_notes: Dict[str, Tuple[str, int]] = {}
 
         # Flask app for URL capture
         self.app = Flask(__name__)
         self._setup_routes()
 
+        # Store version and modification-date watermark at the last listing;
+        # an unchanged store isn't listed, a changed one mostly only since then
+        self._reminders_listing = _ListingState()
+        self._notes_listing = _ListingState()
+
+        # Actions run on a writer thread so the next envelope's brain call can
+        # start meanwhile. Items queued but not yet finished are "in flight".
+        self._writer_q: queue.Queue = queue.Queue()
+        self._writer_thread = None
+        self._in_flight: Set[str] = set()
+        self._in_flight_lock = threading.Lock()
+
+        # Envelopes read KG context, call the brain and apply its graph updates
+        # one at a time (poll thread and capture requests alike), so each sees
+        # the previous one's updates and they don't overwrite each other
+        self._brain_lock = threading.Lock()
+
+        # File events from the Reminders/Notes stores wake the poll loop early
+        self._changes: queue.Queue = queue.Queue()
+        self._observer = None
+
         self.running = False
 
     def _setup_routes(self):
@@ -84,8 +309,8 @@ class Orchestrator:
                     source_id=url
                 )
 
-                # Process through brain
-                self._process_envelope(envelope)
+                # Process through brain and wait for its actions to run
+                self._process_envelope(envelope).result()
 
                 return jsonify({
                     'success': True,
@@ -108,32 +333,44 @@ class Orchestrator:
 
     def _fetch_url_text(self, url: str) -> str:
         """Fetch URL and extract readable text."""
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        # Use BeautifulSoup for basic text extraction
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove script and style elements
-        for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-            script.decompose()
+        # Stream the body and stop reading past the size cap
+        with self._http.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+
+            # Only headers have been read so far; skip PDFs, media, archives...
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type and content_type not in TEXT_CONTENT_TYPES:
+                raise ValueError(f"Unsupported content type: {content_type}")
+
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body.extend(chunk)
+                if len(body) >= MAX_URL_BYTES:
+                    del body[MAX_URL_BYTES:]
+                    break
+
+            html = body.decode(response.encoding or 'utf-8', errors='replace')
+
+        # Parse with lexbor (C parser) and drop non-content elements
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(['script', 'style', 'nav', 'footer', 'header'])
+        if tree.body is None:
+            return ''
 
         # Get text
-        text = soup.get_text()
+        text = tree.body.text(separator='')
 
         # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
+        text = _CLEAN_RE.sub('\n', text).strip()
 
         return text
 
     def _create_envelope(self, channel: str, user_text: str,
-                        source_id: str) -> Dict:
-        """Create an envelope for the brain."""
+                        source_id: str, timestamp: Optional[str] = None) -> Dict:
+        """Create an envelope for the brain (timestamp defaults to now)."""
         return {
             'user_id': 'local-user',
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': timestamp or datetime.now(timezone.utc).isoformat(),
             'timezone': 'America/Los_Angeles',
             'channel': channel,
             'mode_hint': 'capture',
@@ -141,62 +378,142 @@ class Orchestrator:
             'source_id': source_id
         }
 
-    def _process_envelope(self, envelope: Dict):
-        """Process an envelope through the brain and execute actions."""
+    def _process_envelope(self, envelope: Dict,
+                          on_done: Optional[Callable[[bool], None]] = None) -> Future:
+        """
+        Process an envelope through the brain and apply its graph updates,
+        then queue its actions for the writer thread.
+
+        Returns a Future that resolves to True once the actions have run and
+        the interaction is logged, or False if processing failed; `on_done`
+        is called with that flag.
+        """
+        done: Future = Future()
+        if on_done:
+            done.add_done_callback(lambda future: on_done(future.result()))
+
         try:
-            # Get KG context
-            kg_context = self.kg.get_kg_context(context_type='grocery')
+            with self._brain_lock:
+                # Get KG context
+                kg_context = self.kg.get_kg_context(context_type='grocery')
+
+                # Call brain (simple grocery reminders skip the model)
+                print(f"\n→ Processing {envelope['channel']}: {envelope['source_id'][:50]}...")
+                model_output = self.fast_path.try_handle(envelope, kg_context)
+                if model_output is None:
+                    model_output = self.brain.call_brain(envelope, kg_context)
+
+                # Apply graph updates now (one transaction for the whole batch), so
+                # the next envelope's KG context already includes them
+                graph_update_results = self.kg.apply_graph_updates(
+                    model_output.get('graph_updates', []), now=envelope['timestamp'])
+                for result in graph_update_results:
+                    if not result['success']:
+                        print(f"  ✗ Graph update failed: {result['error']}")
+
+                # Queue under the lock so actions run in the order their
+                # envelopes saw the KG (a later note layout must land last)
+                self._writer_q.put((envelope, model_output, graph_update_results, done))
 
-            # Call brain
-            print(f"\n→ Processing {envelope['channel']}: {envelope['source_id'][:50]}...")
-            model_output = self.brain.call_brain(envelope, kg_context)
+        except Exception as e:
+            self._log_error(envelope, e)
+            done.set_result(False)
 
-            # Apply graph updates
-            graph_update_results = []
-            for update in model_output.get('graph_updates', []):
-                try:
-                    result_id = self.kg.apply_graph_update(update)
-                    graph_update_results.append({'success': True, 'id': result_id})
-                except Exception as e:
-                    graph_update_results.append({'success': False, 'error': str(e)})
-                    print(f"  ✗ Graph update failed: {e}")
-
-            # Execute actions
-            actions = model_output.get('actions', [])
-            execution_results = self.executor.execute_actions(actions)
-
-            # Log interaction
-            self.logger.log_interaction(
-                envelope=envelope,
-                model_output=model_output,
-                execution_results={
-                    'graph_updates': graph_update_results,
-                    'actions': execution_results
-                }
-            )
+        return done
 
-            print(f"  ✓ Processed successfully: {execution_results['success_count']} actions executed")
+    def _writer_loop(self):
+        """Execute queued actions in order and log each interaction."""
+        while True:
+            item = self._writer_q.get()
+            if item is None:
+                return
 
-        except Exception as e:
-            print(f"  ✗ Error processing envelope: {e}")
-            self.logger.log_interaction(
-                envelope=envelope,
-                model_output={},
-                execution_results={},
-                errors=[str(e)]
-            )
+            envelope, model_output, graph_update_results, done = item
+            success = False
+            try:
+                # Execute actions
+                actions = model_output.get('actions', [])
+                execution_results = self.executor.execute_actions(actions)
+
+                # Log interaction
+                self.logger.log_interaction(
+                    envelope=envelope,
+                    model_output=model_output,
+                    execution_results={
+                        'graph_updates': graph_update_results,
+                        'actions': execution_results
+                    }
+                )
+
+                print(f"  ✓ Processed successfully: {execution_results['success_count']} actions executed")
+                success = True
+
+            except Exception as e:
+                self._log_error(envelope, e)
+
+            finally:
+                done.set_result(success)
+
+    def _log_error(self, envelope: Dict, error: Exception):
+        """Report and log an envelope that failed to process."""
+        print(f"  ✗ Error processing envelope: {error}")
+        self.logger.log_interaction(
+            envelope=envelope,
+            model_output={},
+            execution_results={},
+            errors=[str(error)]
+        )
+
+    def _begin(self, source_id: str) -> bool:
+        """Mark a source item in flight; False if it already is."""
+        with self._in_flight_lock:
+            if source_id in self._in_flight:
+                return False
+            self._in_flight.add(source_id)
+            return True
+
+    def _reminder_done(self, reminder_id: str, success: bool):
+        """
+        Mark a reminder processed once the writer has finished it. Failed
+        reminders are only skipped until restart, so a restart retries them.
+        """
+        self.processed_reminders.add(reminder_id)
+        if success:
+            self.kg.mark_processed(reminder_id, 'reminder')
+        with self._in_flight_lock:
+            self._in_flight.discard(reminder_id)
+
+    def _note_done(self, note_id: str, modification_date: str, content_hash: int,
+                   success: bool):
+        """Mark a note version processed once the writer has finished it."""
+        self.processed_notes[note_id] = content_hash
+        self._seen_notes[note_id] = (modification_date, content_hash)
+        with self._in_flight_lock:
+            self._in_flight.discard(note_id)
 
     def _watch_reminders(self):
         """Watch for new reminders and process them."""
-        reminders = RemindersIntegration.list_reminders()
+        # Skip the AppleScript listing if the Reminders database hasn't changed
+        version = RemindersIntegration.store_version()
+        if self._reminders_listing.unchanged(version):
+            return
+
+        since = self._reminders_listing.since(version)
+        reminders = RemindersIntegration.list_reminders(since=since)
+        if reminders is None:
+            # Listing failed; try again next pass
+            return
+        now = datetime.now(timezone.utc).isoformat()
 
         for reminder in reminders:
             reminder_id = reminder.get('id')
             completed = reminder.get('completed', False)
 
-            # Skip if already processed or completed
+            # Skip if already processed, completed or still being processed
             if reminder_id in self.processed_reminders or completed:
                 continue
+            if not self._begin(reminder_id):
+                continue
 
             # Process this reminder
             name = reminder.get('name', '')
@@ -206,17 +523,30 @@ class Orchestrator:
             envelope = self._create_envelope(
                 channel='reminder',
                 user_text=user_text,
-                source_id=reminder_id
+                source_id=reminder_id,
+                timestamp=now
             )
 
-            self._process_envelope(envelope)
+            # Marked as processed once its actions have run
+            self._process_envelope(
+                envelope, on_done=functools.partial(self._reminder_done, reminder_id))
 
-            # Mark as processed
-            self.processed_reminders.add(reminder_id)
+        self._reminders_listing.record(version, reminders, since)
 
     def _watch_notes(self):
         """Watch for new/updated notes and process them."""
-        notes = NotesIntegration.list_notes()
+        # Skip the AppleScript listing if the Notes database hasn't changed
+        version = NotesIntegration.store_version()
+        if self._notes_listing.unchanged(version):
+            return
+
+        since = self._notes_listing.since(version)
+        notes = NotesIntegration.list_notes(since=since)
+        if notes is None:
+            # Listing failed; try again next pass
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        held = []
 
         for note in notes:
             note_id = note.get('id')
@@ -227,32 +557,89 @@ class Orchestrator:
             if name == 'Groceries':
                 continue
 
+            # Skip without hashing if Notes reports no modification since last poll
+            modification_date = note.get('modification_date')
+            seen = self._seen_notes.get(note_id)
+            if seen and modification_date and seen[0] == modification_date:
+                continue
+
             # Calculate content hash
             content = f"{name}\n{body}"
-            content_hash = hashlib.md5(content.encode()).hexdigest()
+            content_hash = xxhash.xxh3_64_intdigest(content.encode())
 
-            # Skip if already processed with same content
-            if note_id in self.processed_notes and self.processed_notes[note_id] == content_hash:
+            # Skip if already processed with same content, or if it doesn't
+            # look like a recipe (contains "ingredients" or looks like a list)
+            if self.processed_notes.get(note_id) == content_hash or not _RECIPE_RE.search(content):
+                self._seen_notes[note_id] = (modification_date, content_hash)
                 continue
 
-            # Only process if it looks like it might be a recipe
-            # (contains "ingredients" or looks like a list)
-            if 'ingredient' in content.lower() or any(c in content for c in ['•', '-', '*']):
-                envelope = self._create_envelope(
-                    channel='apple_note',
-                    user_text=content,
-                    source_id=note_id
-                )
+            if not self._begin(note_id):
+                # Edited while the previous version is in flight; retry next pass
+                held.append(note)
+                continue
+
+            envelope = self._create_envelope(
+                channel='apple_note',
+                user_text=content,
+                source_id=note_id,
+                timestamp=now
+            )
+
+            # Marked as processed once its actions have run
+            self._process_envelope(
+                envelope, on_done=functools.partial(
+                    self._note_done, note_id, modification_date, content_hash))
+
+        self._notes_listing.record(version, notes, since, held)
 
-                self._process_envelope(envelope)
+    def _start_observer(self):
+        """Watch the Reminders/Notes stores for changes, if they exist."""
+        observer = Observer()
+        handler = _ChangeHandler(self._changes)
+        watched = 0
+        for path, recursive in WATCH_PATHS:
+            if path.is_dir():
+                try:
+                    observer.schedule(handler, str(path), recursive=recursive)
+                    watched += 1
+                except OSError as e:
+                    print(f"Cannot watch {path}: {e}")
+
+        if not watched:
+            return
 
-                # Mark as processed
-                self.processed_notes[note_id] = content_hash
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+    def _wait_for_changes(self):
+        """Block until a store changes (plus a debounce) or the poll interval passes."""
+        try:
+            self._changes.get(timeout=self.poll_interval)
+        except queue.Empty:
+            return
+
+        # Drain the rest of the burst, but rescan within a poll interval of the
+        # first event even if the store never goes quiet (sync, autosave)
+        deadline = time.monotonic() + self.poll_interval
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                self._changes.get(timeout=min(DEBOUNCE_SECONDS, remaining))
+            except queue.Empty:
+                return
 
     def _poll_loop(self):
         """Main polling loop."""
+        self._start_observer()
+
         print(f"\n🧠 Second Brain Orchestrator started")
-        print(f"   Polling every {self.poll_interval}s")
+        if self._observer:
+            print(f"   Rescanning on changes (and at least every {self.poll_interval}s)")
+        else:
+            print(f"   Polling every {self.poll_interval}s")
         print(f"   Watching Reminders and Notes...")
 
         while self.running:
@@ -266,13 +653,17 @@ class Orchestrator:
             except Exception as e:
                 print(f"Error in poll loop: {e}")
 
-            # Sleep before next poll
-            time.sleep(self.poll_interval)
+            # Wait for a change or the next poll
+            self._wait_for_changes()
 
     def start(self, port: int = 8898):
         """Start the orchestrator service."""
         self.running = True
 
+        # Start the action writer
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
         # Start polling in background thread
         poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
         poll_thread.start()
@@ -282,11 +673,36 @@ class Orchestrator:
         print(f"   POST /capture/url with {{'url': '...'}}")
         print(f"   GET /health for status\n")
 
-        self.app.run(host='127.0.0.1', port=port, debug=False)
+        # Threaded WSGI server; URL fetches run concurrently, brain calls and
+        # graph updates are serialized by _brain_lock
+        serve(self.app, host='127.0.0.1', port=port, threads=8, connection_limit=64)
 
     def stop(self):
         """Stop the orchestrator service."""
         self.running = False
+        if self._observer:
+            self._observer.stop()
+
+        # Let queued actions finish before closing the database
+        if self._writer_thread:
+            self._writer_q.put(None)
+            self._writer_thread.join(timeout=60)
+
+        self.logger.stop()
+        self.kg.close()
+
+
+def _newest_modification(items: List[Dict], current: Optional[str]) -> Optional[str]:
+    """Latest modification_date among items (ISO strings sort chronologically)."""
+    dates = [item['modification_date'] for item in items if item.get('modification_date')]
+    if current:
+        dates.append(current)
+    return max(dates, default=None)
+
+
+def _row_counts(version) -> Tuple:
+    """Row count per store from a store_version() summary."""
+    return tuple(store[0] for store in version)
 
 
 def main():
@@ -39,6 +39,14 @@ try:
     result_id = kg.apply_graph_update(update)
     print(f"   ✓ Applied graph update: {result_id}")
 
+    # Apply a batch of graph updates
+    results = kg.apply_graph_updates([update, {
+        "op_type": "update_node",
+        "payload": {"id": node_id, "properties": {"quantity": 2}}
+    }])
+    assert all(r['success'] for r in results), f"Batch update failed: {results}"
+    print(f"   ✓ Applied {len(results)} graph updates in one batch")
+
     print("   ✓ Knowledge Graph Database: PASS")
 
 except Exception as e:
@@ -87,10 +95,14 @@ try:
 
     # Test Reminders
     reminders = RemindersIntegration.list_reminders()
+    if reminders is None:
+        raise RuntimeError("Listing reminders failed")
     print(f"   ✓ Listed {len(reminders)} reminders")
 
     # Test Notes
     notes = NotesIntegration.list_notes()
+    if notes is None:
+        raise RuntimeError("Listing notes failed")
     print(f"   ✓ Listed {len(notes)} notes")
 
     print("   ✓ Apple Integrations: PASS")
@@ -150,6 +162,117 @@ except Exception as e:
     print(f"   ✗ Interaction Logger: FAIL - {e}")
     sys.exit(1)
 
+# Test 6: Fast Path
+print("\n6. Testing Fast Path...")
+try:
+    from fast_path import FastPath
+
+    fast_path = FastPath()
+    envelope = {
+        "channel": "reminder",
+        "user_text": "Buy pasta, rice, and tomatoes",
+        "source_id": "test-fast-path"
+    }
+
+    # A simple grocery reminder is handled without the model
+    result = fast_path.try_handle(envelope, {"grocery_items": []})
+    assert result is not None, "Simple grocery reminder not handled"
+    labels = [u["payload"]["label"] for u in result["graph_updates"]]
+    assert labels == ["Pasta", "Rice", "Tomato"], f"Unexpected items: {labels}"
+    action_types = [a["action_type"] for a in result["actions"]]
+    assert action_types == ["update_apple_note", "delete_reminder"], f"Unexpected actions: {action_types}"
+    print(f"   ✓ Handled '{envelope['user_text']}': {', '.join(labels)}")
+
+    # Anything that isn't a known grocery list goes to the model
+    assert fast_path.try_handle({**envelope, "user_text": "get the kids"}) is None, \
+        "Non-grocery reminder should fall back to the model"
+    print("   ✓ 'get the kids' falls back to the model")
+
+    # Items already in the KG aren't created again, but stay on the note
+    kg_context = {"grocery_items": [
+        {"label": "Pasta", "properties": {"category": "Pantry & Dry Goods"}}
+    ]}
+    result = fast_path.try_handle(envelope, kg_context)
+    labels = [u["payload"]["label"] for u in result["graph_updates"]]
+    assert "Pasta" not in labels, "Known item created again"
+    note_items = [item["text"]
+                  for section in result["actions"][0]["arguments"]["layout"]["sections"]
+                  for item in section["items"]]
+    assert "Pasta" in note_items, "Known item dropped from the note"
+    print("   ✓ Known items are not duplicated")
+
+    print("   ✓ Fast Path: PASS")
+
+except Exception as e:
+    print(f"   ✗ Fast Path: FAIL - {e}")
+    sys.exit(1)
+
+# Test 7: Brain Response Cache
+print("\n7. Testing Brain Response Cache...")
+try:
+    import os
+    import tempfile
+    import time
+    from brain_cache import ResponseCache
+    from brain_client import BrainClient
+
+    cache_path = os.path.join(tempfile.mkdtemp(), "test_cache.sqlite")
+    cache = ResponseCache(db_path=cache_path)
+
+    envelope = {
+        "channel": "reminder",
+        "mode_hint": "capture",
+        "user_text": "Buy pasta",
+        "source_id": "r-1"
+    }
+    kg_context = {"grocery_items": [
+        {"id": "n-1", "type": "GroceryItem", "label": "Rice",
+         "properties": {"category": "Pantry & Dry Goods"}, "updated_at": "2025-01-15T10:00:00Z"}
+    ]}
+    output = {
+        "interaction_intent": "store_only",
+        "answer": "",
+        "graph_updates": [],
+        "actions": [{"action_type": "delete_reminder", "arguments": {"source_id": "r-1"}}]
+    }
+    cache.put(envelope, kg_context, output)
+
+    # Same text, new reminder; node ids and timestamps in the context don't count
+    same_context = {"grocery_items": [
+        {**kg_context["grocery_items"][0], "id": "n-2", "updated_at": "2025-01-16T09:00:00Z"}
+    ]}
+    cached = cache.get({**envelope, "user_text": "  buy PASTA ", "source_id": "r-2"}, same_context)
+    assert cached is not None, "Expected a cache hit"
+    assert cached["actions"][0]["arguments"]["source_id"] == "r-2", \
+        f"source_id not rewritten: {cached['actions']}"
+    print("   ✓ Hit for the same text, with source_id pointed at the new reminder")
+
+    # A different KG context (the note layout depends on it) misses
+    changed_context = {"grocery_items": kg_context["grocery_items"] + [
+        {"id": "n-3", "type": "GroceryItem", "label": "Basil", "properties": {"category": "Produce"}}
+    ]}
+    assert cache.get(envelope, changed_context) is None, "Expected a miss for a changed context"
+    print("   ✓ Miss when the KG context changes")
+
+    # Expired entries miss
+    time.sleep(0.01)
+    assert ResponseCache(db_path=cache_path, ttl_seconds=0).get(envelope, kg_context) is None, \
+        "Expected a miss after the TTL"
+    print("   ✓ Miss after the TTL")
+
+    # The fallback for invalid model JSON is never cached
+    client = BrainClient(cache=cache, warmup=False)
+    other = {**envelope, "user_text": "Buy rice"}
+    client._parse_output(other, kg_context, "not json")
+    assert cache.get(other, kg_context) is None, "Invalid JSON fallback was cached"
+    print("   ✓ Invalid JSON fallback not cached")
+
+    print("   ✓ Brain Response Cache: PASS")
+
+except Exception as e:
+    print(f"   ✗ Brain Response Cache: FAIL - {e}")
+    sys.exit(1)
+
 # Summary
 print("\n" + "=" * 60)
 print("✓ ALL TESTS PASSED")